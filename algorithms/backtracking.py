@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
 
@@ -25,10 +25,16 @@ class BacktrackingSolver(NonogramSolver):
         WHITE = 0
         BLACK = 1
 
+        # Line results remembered per solve before the memo is reset
+        line_cache_size = 1 << 16
+
         def _solve_internal(self) -> List[List[int]]:
                 """
                 Main driver for the solving process.
                 """
+                # (clues, length, black mask, white mask) -> (all black, any black)
+                self._line_cache = {}
+
                 # Initialize board
                 self.board = np.full(
                         (self.height, self.width), self.UNKNOWN, dtype=np.int8
@@ -43,21 +49,26 @@ class BacktrackingSolver(NonogramSolver):
                 else:
                         return []
 
-        def _propagate(self) -> bool:
+        def _propagate(self, dirty_rows=None, dirty_cols=None) -> bool:
                 """
                 Implements the Logical Rules Filter, which repeatedly applies constraint propagation to deduce cell values.
                 The process continues until no new information can be derived (board reaches a stable state).
 
+                Only lines that may have changed are re-solved: dirty_rows and
+                dirty_cols (all lines when None), then the lines crossing each
+                cell a deduction sets.
+
                 Returns:
                     bool: True if the board is in a valid state with no contradictions.
                           False if a contradiction is found (a line has 0 valid permutations).
                 """
-                changed = True
-                while changed:
-                        changed = False
+                pending_rows = set(range(self.height) if dirty_rows is None else dirty_rows)
+                pending_cols = set(range(self.width) if dirty_cols is None else dirty_cols)
 
+                while pending_rows or pending_cols:
                         # --- ROWS ---
-                        for r in range(self.height):
+                        rows, pending_rows = sorted(pending_rows), set()
+                        for r in rows:
                                 current_row = self.board[r, :]
 
                                 # Check intersection of possibilities
@@ -66,12 +77,14 @@ class BacktrackingSolver(NonogramSolver):
                                 if new_row is None:
                                         return False  # Contradiction
 
-                                if not np.array_equal(current_row, new_row):
+                                changed = np.flatnonzero(current_row != new_row)
+                                if changed.size:
                                         self.board[r, :] = new_row
-                                        changed = True
+                                        pending_cols.update(changed.tolist())
 
                         # --- COLUMNS ---
-                        for c in range(self.width):
+                        cols, pending_cols = sorted(pending_cols), set()
+                        for c in cols:
                                 current_col = self.board[:, c]
 
                                 # Check intersection of possibilities
@@ -80,9 +93,10 @@ class BacktrackingSolver(NonogramSolver):
                                 if new_col is None:
                                         return False  # Contradiction
 
-                                if not np.array_equal(current_col, new_col):
+                                changed = np.flatnonzero(current_col != new_col)
+                                if changed.size:
                                         self.board[:, c] = new_col
-                                        changed = True
+                                        pending_rows.update(changed.tolist())
 
                 return True
 
@@ -95,50 +109,81 @@ class BacktrackingSolver(NonogramSolver):
                 - Cells shared by all valid perms become BLACK.
                 - Cells unreachable by any perm become WHITE.
                 - Generates only permutations that fit the 'line' constraints (e.g. existing BLACKs).
+
+                Lines and permutations are int bitmasks (bit k = cell k), so the
+                intersection is a running AND/OR instead of a permutation matrix.
                 """
                 length = len(current_line)
-
-                # Generate all valid permutations for this line that respect currently known cells
-                perms_list = self._generate_permutations(current_line, clues, length)
-
-                if not perms_list:
+                black = self._line_mask(current_line == self.BLACK)
+                white = self._line_mask(current_line == self.WHITE)
+
+                # Backtracking keeps reaching the same partial lines again
+                key = (tuple(clues), length, black, white)
+                masks = self._line_cache.get(key, False)
+                if masks is False:
+                        masks = self._intersect_permutations(black, white, clues, length)
+                        if len(self._line_cache) >= self.line_cache_size:
+                                self._line_cache.clear()
+                        self._line_cache[key] = masks
+
+                if masks is None:
                         return None  # Contradiction
+                all_black, any_black = masks
 
-                # If only 1 perm exists, that's the answer
-                if len(perms_list) == 1:
-                        return np.array(perms_list[0], dtype=np.int8)
-
-                # Find Intersection
-                perms_matrix = np.array(perms_list, dtype=np.int8)
-
-                # Find columns where ALL rows are BLACK (1)
-                # axis=0 means "look down the column across all permutations"
-                all_black = np.all(perms_matrix == self.BLACK, axis=0)
-
-                # Find columns where ALL rows are WHITE (0)
-                all_white = np.all(perms_matrix == self.WHITE, axis=0)
-
-                # Construct the result line
+                # Construct the result line; known cells are kept, since every
+                # valid permutation agrees with them
                 result_line = np.full(length, self.UNKNOWN, dtype=np.int8)
-                result_line[all_black] = self.BLACK
-                result_line[all_white] = self.WHITE
-
-                # Merge the new deductions with the existing knowledge
-                # This ensures we don't accidentally unset a known value, though intersection logic shouldn't
-                mask_known = current_line != self.UNKNOWN
-                result_line[mask_known] = current_line[mask_known]
+                result_line[self._mask_cells(all_black, length)] = self.BLACK
+                result_line[~self._mask_cells(any_black, length)] = self.WHITE
 
                 return result_line
 
+        def _intersect_permutations(
+                self, black: int, white: int, clues: List[int], length: int
+        ) -> Optional[Tuple[int, int]]:
+                """
+                AND and OR of all valid permutations, or None if there are none.
+                """
+                # Fold every valid permutation into its AND and OR as it is found
+                perms = self._generate_permutations(black, white, clues, length)
+                all_black = (1 << length) - 1
+                any_black = 0
+                found = False
+                for perm in perms:
+                        all_black &= perm
+                        any_black |= perm
+                        found = True
+
+                return (all_black, any_black) if found else None
+
+        @staticmethod
+        def _line_mask(cells: np.ndarray) -> int:
+                """Pack a boolean line into an int, bit k = cell k."""
+                return int.from_bytes(
+                        np.packbits(cells, bitorder="little").tobytes(), "little"
+                )
+
+        @staticmethod
+        def _mask_cells(mask: int, length: int) -> np.ndarray:
+                """Unpack an int line mask back into a boolean array."""
+                packed = np.frombuffer(
+                        mask.to_bytes((length + 7) // 8, "little"), dtype=np.uint8
+                )
+                return np.unpackbits(packed, count=length, bitorder="little").astype(
+                        bool
+                )
+
         def _generate_permutations(
-                self, current_line: np.ndarray, clues: List[int], length: int
-        ) -> List[List[int]]:
+                self, black: int, white: int, clues: List[int], length: int
+        ) -> Iterator[int]:
                 """
-                Generates all valid permutations of 'clues' that fit into 'current_line'.
-                Prunes branches early if they conflict with known BLACK/WHITE cells in current_line.
+                Generates all valid permutations of 'clues' that fit the line whose
+                known BLACK and WHITE cells are the bitmasks 'black' and 'white'.
+                Prunes branches early if they conflict with known cells.
+                Each permutation is yielded as the bitmask of its BLACK cells.
                 """
-                results = []
                 clues_tuple = tuple(clues)  # lighter to pass around
+                last = len(clues_tuple) - 1
 
                 # Pre-calculate minimum space needed for remaining blocks
                 # e.g., clues [2, 1] needs 2 + 1 + 1 = 4 spaces minimum
@@ -153,23 +198,9 @@ class BacktrackingSolver(NonogramSolver):
                 def recursive_search(index, clue_idx, current_build):
                         # Base Case: All clues placed
                         if clue_idx == len(clues_tuple):
-                                remaining_len = length - index
-
-                                # Verify tail against constraints
-                                # (Check if we are overwriting a known BLACK with WHITE)
-                                valid = True
-                                # Check if any remaining cell in current_line is BLACK
-                                for k in range(index, length):
-                                        if current_line[k] == self.BLACK:
-                                                valid = False
-                                                break
-
-                                if valid:
-                                        # Found a valid full line
-                                        results.append(
-                                                current_build
-                                                + [self.WHITE] * remaining_len
-                                        )
+                                # The tail is white: it must hold no known BLACK
+                                if not black >> index:
+                                        yield current_build
                                 return
 
                         # Pruning: Not enough space left
@@ -177,6 +208,7 @@ class BacktrackingSolver(NonogramSolver):
                                 return
 
                         block_size = clues_tuple[clue_idx]
+                        block = (1 << block_size) - 1
 
                         # Try placing the block at every possible start position 's'
                         # Range: from 'index' up to limit
@@ -186,63 +218,41 @@ class BacktrackingSolver(NonogramSolver):
 
                         for s in range(index, limit):
                                 # CHECK A: Can we place GAP (White) before this block?
-                                # We need (s - index) white cells.
-                                gap_ok = True
-                                for k in range(index, s):
-                                        if current_line[k] == self.BLACK:
-                                                gap_ok = False
-                                                break
-                                if not gap_ok:
+                                # The gap grows by cell s - 1 at each step
+                                if s > index and black >> (s - 1) & 1:
                                         break
 
                                 # CHECK B: Can we place the BLOCK (Black)?
-                                block_ok = True
-                                for k in range(s, s + block_size):
-                                        if current_line[k] == self.WHITE:
-                                                block_ok = False
-                                                break
+                                if white & (block << s):
+                                        continue
+
+                                next_index = s + block_size
 
                                 # CHECK C: Mandatory Trailing Gap (White)
                                 # If not the last block, cell after block MUST be white.
-                                if clue_idx < len(clues_tuple) - 1:
-                                        if (
-                                                s + block_size < length
-                                                and current_line[s + block_size]
-                                                == self.BLACK
-                                        ):
-                                                block_ok = False
-
-                                if block_ok:
-                                        # Build segment: [Whites...] + [Blacks...] + [White (separator)]
-                                        # We don't add the separator here explicitly in recursion logic to keep indices clean, but we account for it in 'next_index'.
-                                        new_segment = [self.WHITE] * (s - index) + [
-                                                self.BLACK
-                                        ] * block_size
-
-                                        next_index = s + block_size
-
-                                        # If not last block, force a separator (implicit white)
-                                        if clue_idx < len(clues_tuple) - 1:
-                                                new_segment.append(self.WHITE)
-                                                next_index += 1
-
-                                        recursive_search(
-                                                next_index,
-                                                clue_idx + 1,
-                                                current_build + new_segment,
-                                        )
-
-                recursive_search(0, 0, [])
-                return results
-
-        def _backtrack(self) -> bool:
+                                if clue_idx < last:
+                                        if black >> next_index & 1:
+                                                continue
+                                        next_index += 1
+
+                                yield from recursive_search(
+                                        next_index,
+                                        clue_idx + 1,
+                                        current_build | (block << s),
+                                )
+
+                return recursive_search(0, 0, 0)
+
+        def _backtrack(self, dirty_rows=None, dirty_cols=None) -> bool:
                 """
                 Recursive Backtracking step.
                 Finds the first UNKNOWN cell, guesses, and recurses.
+                dirty_rows/dirty_cols name the lines touched since the last
+                propagation (None: all of them).
                 """
 
                 # Propagate constraints first
-                if not self._propagate():
+                if not self._propagate(dirty_rows, dirty_cols):
                         return False
 
                 # Heuristic: Find first UNKNOWN cell
@@ -258,13 +268,13 @@ class BacktrackingSolver(NonogramSolver):
                 # Guess BLACK
                 snapshot = self.board.copy()
                 self.board[target_r, target_c] = self.BLACK
-                if self._backtrack():
+                if self._backtrack((target_r,), (target_c,)):
                         return True
 
                 # Restore and Guess WHITE
                 self.board = snapshot
                 self.board[target_r, target_c] = self.WHITE
-                if self._backtrack():
+                if self._backtrack((target_r,), (target_c,)):
                         return True
 
                 # Fail
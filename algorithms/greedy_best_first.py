@@ -1,5 +1,6 @@
 import heapq
-from itertools import combinations
+from itertools import chain, combinations
+from math import comb
 
 import numpy as np
 
@@ -9,12 +10,17 @@ from .__base__ import NonogramSolver
 class NonogramState:
         _state_counter = 0
 
-        def __init__(self, board, rows_possible, cols_possible):
+        def __init__(self, board, rows_possible, cols_possible, unknown_count=None):
                 self.board = board
                 self.rows_possible = rows_possible
                 self.cols_possible = cols_possible
                 self.m = len(board)
                 self.n = len(board[0])
+                # Number of undecided (0) cells, kept up to date by the solver so that
+                # is_goal() does not have to scan the board
+                if unknown_count is None:
+                        unknown_count = sum(row.count(0) for row in board)
+                self.unknown_count = unknown_count
                 self.counter = NonogramState._state_counter
                 NonogramState._state_counter += 1
 
@@ -22,18 +28,18 @@ class NonogramState:
                 return self.counter < other.counter
 
         def copy(self):
-                # Manual deep copy is significantly faster than copy.deepcopy for NumPy structures
+                # Possibility arrays are never mutated in place (_remove_possibilities
+                # returns a fresh masked array), so children can share them by reference;
+                # only the outer lists need copying.
                 return NonogramState(
                         [row[:] for row in self.board],
-                        [p.copy() for p in self.rows_possible],
-                        [p.copy() for p in self.cols_possible],
+                        list(self.rows_possible),
+                        list(self.cols_possible),
+                        self.unknown_count,
                 )
 
         def is_goal(self):
-                for row in self.board:
-                        if 0 in row:
-                                return False
-                return True
+                return self.unknown_count == 0
 
         def get_hash(self):
                 # Hash the board state and the size of the possibility space
@@ -92,6 +98,7 @@ class GreedyBestFirstSolver(NonogramSolver):
                         for val in possible_vals:
                                 new_state = current.copy()
                                 new_state.board[i][j] = val
+                                new_state.unknown_count -= 1
 
                                 new_state.rows_possible[i] = self._remove_possibilities(
                                         new_state.rows_possible[i], j, val
@@ -118,25 +125,35 @@ class GreedyBestFirstSolver(NonogramSolver):
                 for v in values:
                         groups = len(v)
                         no_empty = no_of_other - sum(v) - groups + 1
-                        ones = [[1] * x for x in v]
-                        res = self._create_line_permutations(no_empty, groups, ones)
-                        possibilities.append(np.array(res, dtype=np.int8))
+                        res = self._create_line_permutations(no_empty, groups, v)
+                        possibilities.append(res)
                 return possibilities
 
-        def _create_line_permutations(self, no_empty, groups, ones):
-                res_opts = []
-                for p in combinations(range(groups + no_empty), groups):
-                        selected = [-1] * (groups + no_empty)
-                        ones_ind = 0
-                        for val in p:
-                                selected[val] = ones_ind
-                                ones_ind += 1
-                        res_opt = [
-                                ones[val] + [-1] if val > -1 else [-1]
-                                for val in selected
-                        ]
-                        res_opt = [item for sublist in res_opt for item in sublist][:-1]
-                        res_opts.append(res_opt)
+        def _create_line_permutations(self, no_empty, groups, clues):
+                # Stars and bars: choose which of the (groups + no_empty) slots hold a
+                # block; every slot is followed by one empty cell (dropped at the end).
+                slots = groups + no_empty
+                length = slots + sum(clues) - 1
+                if groups == 0:
+                        return np.full((1, length), -1, dtype=np.int8)
+                if slots < groups:
+                        return np.empty((0, max(length, 0)), dtype=np.int8)
+
+                count = comb(slots, groups)
+                combos = np.fromiter(
+                        chain.from_iterable(combinations(range(slots), groups)),
+                        dtype=np.int32,
+                        count=count * groups,
+                ).reshape(count, groups)
+
+                # Block k starts at its slot index shifted by the lengths of earlier blocks
+                prefix = np.concatenate(([0], np.cumsum(clues[:-1]))).astype(np.int32)
+                starts = combos + prefix
+
+                res_opts = np.full((count, length), -1, dtype=np.int8)
+                rows = np.arange(count)[:, None]
+                for k, clue in enumerate(clues):
+                        res_opts[rows, starts[:, k : k + 1] + np.arange(clue)] = 1
                 return res_opts
 
         def _heuristic(self, state):
@@ -183,6 +200,7 @@ class GreedyBestFirstSolver(NonogramSolver):
                                 for j, val in cells:
                                         if not state.board[i][j]:
                                                 state.board[i][j] = val
+                                                state.unknown_count -= 1
                                                 state.cols_possible[j] = (
                                                         self._remove_possibilities(
                                                                 state.cols_possible[j],
@@ -205,6 +223,7 @@ class GreedyBestFirstSolver(NonogramSolver):
                                 for i, val in cells:
                                         if not state.board[i][j]:
                                                 state.board[i][j] = val
+                                                state.unknown_count -= 1
                                                 state.rows_possible[i] = (
                                                         self._remove_possibilities(
                                                                 state.rows_possible[i],
@@ -221,17 +240,20 @@ class GreedyBestFirstSolver(NonogramSolver):
                 min_opts = float("inf")
                 best_cell = None
 
+                # Which values (-1 / 1) are still reachable at each position of each line
+                row_has_neg = [(p == -1).any(axis=0) for p in state.rows_possible]
+                row_has_pos = [(p == 1).any(axis=0) for p in state.rows_possible]
+                col_has_neg = [(p == -1).any(axis=0) for p in state.cols_possible]
+                col_has_pos = [(p == 1).any(axis=0) for p in state.cols_possible]
+
                 for i in range(state.m):
                         for j in range(state.n):
                                 if not state.board[i][j]:
-                                        row_vals = np.unique(
-                                                state.rows_possible[i][:, j]
-                                        )
-                                        col_vals = np.unique(
-                                                state.cols_possible[j][:, i]
-                                        )
-
-                                        opts = np.intersect1d(row_vals, col_vals)
+                                        opts = []
+                                        if row_has_neg[i][j] and col_has_neg[j][i]:
+                                                opts.append(-1)
+                                        if row_has_pos[i][j] and col_has_pos[j][i]:
+                                                opts.append(1)
 
                                         if len(opts) == 0:
                                                 return None
@@ -1,23 +1,134 @@
 import heapq
 import random
+from functools import lru_cache
+from itertools import accumulate, count
 from typing import List, Tuple
 
+import numpy as np
+
 from .__base__ import NonogramSolver
 
+# Binary digit characters to the cell values they stand for
+_DIGIT_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _make_line_scorer(length, clues, weight):
+        """
+        Build the scorer for one (length, clues) pair: line bits -> weight times
+        the minimum number of cells to flip so the line satisfies its clues.
+
+        Classic left-to-right DP over (cells consumed, blocks placed). The line
+        is padded with one white cell so that every block is followed by a
+        separator. With `slack` spare cells, block k can only start within
+        slack + 1 cells of its earliest position, so each level of the DP
+        works on a window of that size: best[j] is the cheapest layout of the
+        first k blocks in the cells before start + j, the last of them white
+        (less the blocks' lengths, a constant). Everything that depends only
+        on the clues is worked out here, once.
+        """
+        size = length + 1
+        slack = size - sum(clues) - len(clues)
+        if slack < 0:
+                # Clues that cannot fit get a finite worst case, keeping score deltas sane
+                worst = size * weight
+                return lambda line_bits: worst
+        if slack == 0 or not clues:
+                # Exactly one layout fits (packed tight, or all white): the distance
+                # is just the cells that differ from it, no DP needed
+                solution = 0
+                start = 0
+                for block in clues:
+                        solution |= ((1 << block) - 1) << start
+                        start += block + 1
+                return lambda line_bits: bin(line_bits ^ solution).count("1") * weight
+
+        # Slice bounds into the prefix counts per block: the window of block
+        # starts, the window of block ends (= the separators' cells) and the
+        # window of next starts
+        layout = []
+        start = 0
+        for block in clues:
+                end = start + block
+                layout.append(
+                        (start, start + slack + 1, end, end + slack + 1, end + 1, end + slack + 2)
+                )
+                start = end + 1
+        # Every block pays its own length up front; the DP below only tracks
+        # what placement changes, and this constant is added back at the end
+        filled = sum(clues)
+        # Above any offset below (costs and prefix counts are at most size each)
+        unreached = 2 * size + 1
+        digits = "0{}b".format(size)
+
+        def score(line_bits):
+                # black[i] = black cells in [0, i): prefix sums over the cells, read
+                # lowest bit first off the binary digits of the line
+                cells = format(line_bits, digits)[::-1].encode().translate(_DIGIT_VALUES)
+                black = list(accumulate(cells, initial=0))
+
+                # No block placed yet: every consumed cell must be white
+                best = black[: slack + 1]
+                for lo, hi, end_lo, end_hi, next_lo, next_hi in layout:
+                        # Starting the block at offset j costs its whites plus a black
+                        # separator: best[j] - (ends[j] - starts[j]) + (nexts[j] - ends[j]),
+                        # and leaving more cells white before the next block adds the
+                        # blacks among them. Both fold into a running minimum:
+                        # nxt[j] = nexts[j] + min over i <= j of (best + starts - 2 ends)[i]
+                        nxt = []
+                        running = unreached
+                        for prev, starts, ends, nexts in zip(
+                                best, black[lo:hi], black[end_lo:end_hi], black[next_lo:next_hi]
+                        ):
+                                offset = prev + starts - ends - ends
+                                if offset < running:
+                                        running = offset
+                                nxt.append(nexts + running)
+                        best = nxt
+                return (best[slack] + filled) * weight
+
+        return score
+
 
 class BeamState:
         """
         Object storing a candidate solution and its cached scores.
+
+        Besides the board itself, every row and column is kept packed as an int
+        bitmask (bit i set <=> cell i is black), which is what scoring and
+        deduplication operate on.
         """
 
-        def __init__(self, board, row_scores, col_scores, black_count):
+        def __init__(
+                self,
+                board,
+                row_bits,
+                col_bits,
+                row_scores,
+                col_scores,
+                black_count,
+                board_hashes,
+                heuristic_score=None,
+                final_score=None,
+        ):
                 self.board = board
+                # Zobrist hash of the board (XOR of the keys of its black cells)
+                # under each symmetry of the clues, identity first
+                self.board_hashes = board_hashes
+                # Canonical key: equal for boards that are symmetric images
+                self.board_hash = min(board_hashes)
+                self.row_bits = row_bits
+                self.col_bits = col_bits
                 self.row_scores = row_scores
                 self.col_scores = col_scores
                 self.black_count = black_count
                 # Base heuristic: just the line violations
-                self.heuristic_score = sum(row_scores) + sum(col_scores)
-                # Final score will be calculated dynamically
+                if heuristic_score is None:
+                        heuristic_score = sum(row_scores) + sum(col_scores)
+                self.heuristic_score = heuristic_score
+                # Heuristic plus the global count penalty, filled in by the solver
+                self.final_score = final_score
+                # Candidate cells for moves, filled in lazily by the solver
+                self.move_cells = None
 
         def __lt__(self, other):
                 # Tie-breaker for heap
@@ -32,28 +143,78 @@ class LocalBeamSolver(NonogramSolver):
         WHITE = 0
         BLACK = 1
 
+        # Boards are (height, width) arrays of this dtype
+        _board_dtype = np.uint8
+
         # --- Scoring Weights ---
-        # Increase the run_length_weight to force correct block sizes
-        RUN_COUNT_WEIGHT = 50  # Huge penalty for wrong number of blocks
-        RUN_LENGTH_WEIGHT = 2  # Moderate penalty for wrong sizes
+        LINE_DISTANCE_WEIGHT = 10  # Per cell that must change to satisfy a line
         GLOBAL_COUNT_WEIGHT = 100  # Massive penalty for wrong total pixel count
 
         # --- Search Parameters ---
         beam_width = 40  # Sufficient for 10x10 - 20x20
         max_iterations = 5000
         stagnation_threshold = 30
+        # Once the beams' scores collapse into this range, only the best
+        # beam_width // narrow_width_divisor beams (at least 4) are expanded
+        convergence_spread = 20
+        narrow_width_divisor = 2
+        # Temperature, in score units, for sampling survivors (0 keeps plain
+        # top-K); a cell of line distance costs LINE_DISTANCE_WEIGHT
+        selection_temperature = 0
+        # Adaptive width: start with this many beams (None starts at full
+        # beam_width) and double every beam_ramp_period iterations up to it
+        initial_beam_width = None
+        beam_ramp_period = 20
 
         # --- Mutation Parameters ---
         perturbation_ratio = 0.05  # Flip 5% of board during soft reset
 
+        # Seed for the NumPy generator used by board initialization/perturbation
+        # (None draws fresh entropy on every solve)
+        random_seed = None
+
+        # Upper bound on memoized line scores (entries, LRU-evicted)
+        score_cache_size = 1 << 18
+
         def _solve_internal(self) -> List[List[int]]:
                 # Pre-calculate global target (Total black cells needed)
                 self.target_black_count = sum(sum(row_clues) for row_clues in self.rows)
-                self._score_cache = {}
+                self._rng = np.random.default_rng(self.random_seed)
+                # One random 63-bit key per cell; plain ints for fast XOR in the hot loop
+                self._zobrist_np = self._rng.integers(
+                        0, 2**63, size=(self.height, self.width), dtype=np.int64
+                )
+                # The keys as seen through each symmetry the clues admit, so that a
+                # mirrored board hashes like the board it mirrors
+                self._zobrist_views = [
+                        self._zobrist_np[::row_step, ::col_step]
+                        for row_step, col_step in self._clue_symmetries()
+                ]
+                self._zobrist = [view.tolist() for view in self._zobrist_views]
+                # One scorer per distinct (clues, length) pair, specialized on its
+                # clues and shared by every line that has them. Each memoizes on the
+                # bare line bits; together they hold at most score_cache_size entries.
+                row_keys = [(tuple(clues), self.width) for clues in self.rows]
+                col_keys = [(tuple(clues), self.height) for clues in self.columns]
+                distinct = dict.fromkeys(row_keys + col_keys)
+                cache_size = max(1, self.score_cache_size // len(distinct))
+                scorers = {
+                        (clues, length): lru_cache(maxsize=cache_size)(
+                                _make_line_scorer(length, clues, self.LINE_DISTANCE_WEIGHT)
+                        )
+                        for clues, length in distinct
+                }
+                self._row_scorers = [scorers[key] for key in row_keys]
+                self._col_scorers = [scorers[key] for key in col_keys]
+
+                # Beams kept per iteration; ramped up to beam_width when adaptive
+                beam_width = self.beam_width
+                if self.initial_beam_width is not None:
+                        beam_width = max(1, min(beam_width, self.initial_beam_width))
 
                 # Initialize Beams
                 current_beams = []
-                for _ in range(self.beam_width):
+                for _ in range(beam_width):
                         board = self._generate_smart_random_board()
                         state = self._create_state(board)
                         current_beams.append(state)
@@ -61,28 +222,45 @@ class LocalBeamSolver(NonogramSolver):
                 best_global_score = float("inf")
                 best_global_board = None
                 iterations_without_improvement = 0
+                # Beams expanded per iteration; narrowed while converging
+                expand_width = beam_width
+
+                # Hoisted out of the per-move loop below
+                target_black_count = self.target_black_count
+                count_weight = self.GLOBAL_COUNT_WEIGHT
+                evaluate_swap = self._evaluate_swap
+                evaluate_flip = self._evaluate_flip
+                # Ties go to the newest candidate, so a beam yields to an equally
+                # good neighbor (plateau moves); a counter costs less than an RNG draw
+                tiebreak = count(0, -1).__next__
 
                 # Main Loop
                 for iteration in range(self.max_iterations):
-                        # --- Score Calculation ---
-                        # Calculate final score with global penalty
-                        for beam in current_beams:
-                                count_diff = abs(
-                                        beam.black_count - self.target_black_count
-                                )
-                                # If count is perfect, score is just heuristic. If not, massive penalty.
-                                beam.final_score = beam.heuristic_score + (
-                                        count_diff * self.GLOBAL_COUNT_WEIGHT
-                                )
-
-                        # Sort best first
+                        # Widen the search once the first, cheap iterations are done
+                        if (
+                                beam_width < self.beam_width
+                                and iteration
+                                and iteration % self.beam_ramp_period == 0
+                        ):
+                                beam_width = min(self.beam_width, beam_width * 2)
+                                expand_width = min(beam_width, expand_width * 2)
+
+                        # Sort best first (final scores are set when a state is built)
                         current_beams.sort(key=lambda x: x.final_score)
                         best_beam = current_beams[0]
 
                         # Success check
                         if best_beam.final_score == 0:
                                 print(f"Solution found at iteration {iteration}!")
-                                return best_beam.board
+                                return best_beam.board.tolist()
+
+                        # Converging on one leader: refine it with fewer expansions
+                        spread = current_beams[-1].final_score - best_beam.final_score
+                        if spread < self.convergence_spread:
+                                expand_width = min(
+                                        beam_width,
+                                        max(4, beam_width // self.narrow_width_divisor),
+                                )
 
                         # Progress check
                         if best_beam.final_score < best_global_score:
@@ -93,22 +271,38 @@ class LocalBeamSolver(NonogramSolver):
                                 iterations_without_improvement += 1
 
                         # --- Generate Neighbors ---
-                        candidates_heap = []
+                        candidates = []
 
                         # Always keep current beams as candidates (Elitism)
                         for beam in current_beams:
-                                heapq.heappush(
-                                        candidates_heap,
-                                        (beam.final_score, random.random(), beam),
-                                )
+                                candidates.append((beam.final_score, tiebreak(), beam))
+
+                        # Best-first expansion: visit beams by an optimistic bound on
+                        # their neighbors' scores, and stop as soon as no neighbor of the
+                        # remaining beams could beat the K-th best candidate seen so far.
+                        # kth_best is a max-heap (negated) of the K smallest scores.
+                        kth_best = [-beam.final_score for beam in current_beams]
+                        heapq.heapify(kth_best)
+                        expansion_order = sorted(
+                                (
+                                        (self._neighbor_lower_bound(beam), beam)
+                                        for beam in current_beams
+                                ),
+                                key=lambda entry: entry[0],
+                        )
 
                         # Generate new moves
-                        for beam in current_beams:
+                        add_candidate = candidates.append
+                        solved = False
+                        for bound, beam in expansion_order[:expand_width]:
+                                if solved or (
+                                        len(kth_best) >= beam_width and bound > -kth_best[0]
+                                ):
+                                        break
+
                                 # Decide Strategy: FLIP vs SWAP
                                 # If we are close to the correct black count, SWAP is mandatory to avoid penalties.
-                                count_diff = abs(
-                                        beam.black_count - self.target_black_count
-                                )
+                                count_diff = abs(beam.black_count - target_black_count)
                                 use_swap = (
                                         count_diff < 5
                                 )  # Threshold: if count is off by < 5, try swapping
@@ -119,74 +313,118 @@ class LocalBeamSolver(NonogramSolver):
                                         if use_swap:
                                                 # Move is ((r1, c1), (r2, c2))
                                                 p1, p2 = move
-                                                h_score, r_s, c_s, new_cnt = (
-                                                        self._evaluate_swap(
-                                                                beam, p1, p2
-                                                        )
+                                                h_score, r_delta, c_delta, new_cnt = (
+                                                        evaluate_swap(beam, p1, p2)
                                                 )
                                         else:
                                                 # Move is [(r,c), ...]
-                                                h_score, r_s, c_s, new_cnt = (
-                                                        self._evaluate_flip(beam, move)
+                                                h_score, r_delta, c_delta, new_cnt = (
+                                                        evaluate_flip(beam, move)
                                                 )
 
                                         # Calculate penalty
-                                        new_diff = abs(
-                                                new_cnt - self.target_black_count
-                                        )
-                                        final_score = h_score + (
-                                                new_diff * self.GLOBAL_COUNT_WEIGHT
-                                        )
-
-                                        # Add potential candidates to heap
-                                        heapq.heappush(
-                                                candidates_heap,
+                                        new_diff = abs(new_cnt - target_black_count)
+                                        final_score = h_score + new_diff * count_weight
+                                        if len(kth_best) < beam_width:
+                                                heapq.heappush(kth_best, -final_score)
+                                        elif final_score < -kth_best[0]:
+                                                heapq.heapreplace(kth_best, -final_score)
+
+                                        # Add potential candidates
+                                        add_candidate(
                                                 (
                                                         final_score,
-                                                        random.random(),
+                                                        tiebreak(),
                                                         (
                                                                 beam,
                                                                 move,
-                                                                r_s,
-                                                                c_s,
+                                                                r_delta,
+                                                                c_delta,
                                                                 new_cnt,
+                                                                h_score,
                                                                 use_swap,
                                                         ),
                                                 ),
                                         )
+                                        # A solution: selection takes it first, no need
+                                        # to expand any further
+                                        if final_score == 0:
+                                                solved = True
+                                                break
 
                         # --- Selection ---
                         next_beams = []
                         seen_hashes = set()
 
-                        # Take top K unique
-                        while len(next_beams) < self.beam_width and candidates_heap:
-                                score, _, item = heapq.heappop(candidates_heap)
+                        # Take K unique, in stochastic (Gumbel) or plain score order
+                        for score, _, item in self._selection_order(candidates):
+                                if len(next_beams) >= beam_width:
+                                        break
 
                                 if isinstance(item, BeamState):
                                         # Existing beam
-                                        b_hash = self._hash_board(item.board)
+                                        b_hash = item.board_hash
                                         if b_hash not in seen_hashes:
                                                 next_beams.append(item)
                                                 seen_hashes.add(b_hash)
                                 else:
                                         # New Candidate
-                                        parent, move, r_s, c_s, cnt, is_swap = item
-
-                                        if is_swap:
-                                                new_board = self._apply_swap(
-                                                        parent.board, move[0], move[1]
-                                                )
+                                        (
+                                                parent,
+                                                move,
+                                                r_delta,
+                                                c_delta,
+                                                cnt,
+                                                h_score,
+                                                is_swap,
+                                        ) = item
+
+                                        if is_swap and not self._differ_in_color(
+                                                parent, move[0], move[1]
+                                        ):
+                                                flipped = ()  # Same color: no-op swap
                                         else:
-                                                new_board = self._apply_flip(
-                                                        parent.board, move
-                                                )
-
-                                        b_hash = self._hash_board(new_board)
+                                                flipped = move
+
+                                        # Deduplicate on the incrementally updated hash before
+                                        # building anything for the child
+                                        b_hashes = list(parent.board_hashes)
+                                        for view, keys in enumerate(self._zobrist):
+                                                for r, c in flipped:
+                                                        b_hashes[view] ^= keys[r][c]
+                                        b_hash = min(b_hashes)
                                         if b_hash not in seen_hashes:
+                                                row_bits, col_bits = self._flip_bits(
+                                                        parent, flipped
+                                                )
+                                                if is_swap:
+                                                        new_board = self._apply_swap(
+                                                                parent.board,
+                                                                move[0],
+                                                                move[1],
+                                                        )
+                                                else:
+                                                        new_board = self._apply_flip(
+                                                                parent.board, move
+                                                        )
+                                                # Score lists are only materialized for survivors
+                                                row_scores = list(parent.row_scores)
+                                                for r, line_score in r_delta:
+                                                        row_scores[r] = line_score
+                                                col_scores = list(parent.col_scores)
+                                                for c, line_score in c_delta:
+                                                        col_scores[c] = line_score
                                                 next_beams.append(
                                                         BeamState(
-                                                                new_board, r_s, c_s, cnt
+                                                                new_board,
+                                                                row_bits,
+                                                                col_bits,
+                                                                row_scores,
+                                                                col_scores,
+                                                                cnt,
+                                                                b_hashes,
+                                                                h_score,
+                                                                score,
                                                         )
                                                 )
                                                 seen_hashes.add(b_hash)
@@ -198,7 +436,7 @@ class LocalBeamSolver(NonogramSolver):
                                 next_beams = [best_current]  # Keep the best
 
                                 # Fill the rest with neighbors of the best solution instead of random noise
-                                while len(next_beams) < self.beam_width:
+                                while len(next_beams) < beam_width:
                                         mutated_board = self._perturb_board(
                                                 best_current.board
                                         )
@@ -207,60 +445,63 @@ class LocalBeamSolver(NonogramSolver):
                                         )
 
                                 iterations_without_improvement = 0
+                                expand_width = beam_width
 
                         current_beams = next_beams
 
                 print(f"Solution not found. Best score: {best_global_score}")
-                return best_global_board  # type: ignore
+                return best_global_board.tolist()  # type: ignore
 
         # ------------------------------------------------------------------
         # Core Logic
         # ------------------------------------------------------------------
 
+        def _selection_order(self, candidates):
+                """
+                Order candidates for survivor selection.
+
+                Gumbel-top-K: ranking by -score / T plus Gumbel noise samples K
+                candidates without replacement with probability ~ exp(-score / T),
+                which keeps beams from collapsing into one basin. The single best
+                candidate always comes first (elitism).
+                """
+                temperature = self.selection_temperature
+                if temperature <= 0:
+                        return self._pop_in_order(candidates)
+
+                scores = np.array([entry[0] for entry in candidates], dtype=float)
+                gumbel = -np.log(-np.log(self._rng.random(len(candidates))))
+                order = np.argsort(gumbel - scores / temperature)[::-1].tolist()
+                best = int(np.argmin(scores))
+                return [candidates[best]] + [candidates[i] for i in order if i != best]
+
+        @staticmethod
+        def _pop_in_order(candidates):
+                """
+                Candidates in (score, tiebreak) order, popped lazily off a heap.
+
+                Selection stops after beam_width unique survivors, so heapifying and
+                popping only those beats sorting every candidate.
+                """
+                heap = [(entry[0], entry[1], i) for i, entry in enumerate(candidates)]
+                heapq.heapify(heap)
+                while heap:
+                        yield candidates[heapq.heappop(heap)[2]]
+
         def _generate_moves(self, state: BeamState, use_swap: bool):
                 """
                 Generates moves.
                 If use_swap is True, find a Black cell in a bad row and moves it to a White cell.
                 """
-                violated_rows = [r for r, s in enumerate(state.row_scores) if s > 0]
-                violated_cols = [c for c, s in enumerate(state.col_scores) if s > 0]
-
-                # If perfect heuristic but score > 0 (sanity), force random
-                if not violated_rows and not violated_cols:
-                        violated_rows = list(range(self.height))
-                        violated_cols = list(range(self.width))
+                # Candidate cells only depend on the (immutable) state, so beams
+                # carried over to the next iteration reuse them
+                if state.move_cells is None:
+                        state.move_cells = self._move_cells(state, use_swap)
 
                 moves = []
 
                 if use_swap:
-                        # Generate SWAP moves (Move Black -> White)
-                        # 1. Find a black cell involved in a violation
-                        candidates_black = []
-                        # Check violated rows for black cells
-                        for r in violated_rows:
-                                for c in range(self.width):
-                                        if state.board[r][c] == self.BLACK:
-                                                candidates_black.append((r, c))
-                        # Check violated cols for black cells
-                        for c in violated_cols:
-                                for r in range(self.height):
-                                        if state.board[r][c] == self.BLACK:
-                                                candidates_black.append((r, c))
-
-                        # 2. Find a white cell involved in a violation
-                        candidates_white = []
-                        for r in violated_rows:
-                                for c in range(self.width):
-                                        if state.board[r][c] == self.WHITE:
-                                                candidates_white.append((r, c))
-                        for c in violated_cols:
-                                for r in range(self.height):
-                                        if state.board[r][c] == self.WHITE:
-                                                candidates_white.append((r, c))
-
-                        # 3. Create pairs
-                        candidates_black = list(set(candidates_black))
-                        candidates_white = list(set(candidates_white))
+                        candidates_black, candidates_white = state.move_cells
 
                         # Randoml pair
                         if candidates_black and candidates_white:
@@ -270,28 +511,69 @@ class LocalBeamSolver(NonogramSolver):
                                         if b != w:
                                                 moves.append((b, w))
                 else:
-                        # Generate FLIP moves (Standard)
-                        # Intersect rows and cols to find "hot spots"
-                        candidates = set()
-                        for r in violated_rows:
-                                for c in violated_cols:
-                                        candidates.add((r, c))
-
-                        cand_list = list(candidates)
-                        if not cand_list:  # Fallback
-                                cand_list = [
-                                        (r, c)
-                                        for r in violated_rows
-                                        for c in range(self.width)
-                                ]
-
-                        # Sample single flips
-                        sample_size = min(len(cand_list), 20)
-                        for cell in random.sample(cand_list, sample_size):
-                                moves.append([cell])
+                        flip_rows, flip_cols = state.move_cells
+
+                        # Sample single flips straight from the rows x cols product,
+                        # without building it
+                        n_cols = len(flip_cols)
+                        product_size = len(flip_rows) * n_cols
+                        sample_size = min(product_size, 20)
+                        for index in random.sample(range(product_size), sample_size):
+                                i, j = divmod(index, n_cols)
+                                moves.append([(flip_rows[i], flip_cols[j])])
 
                 return moves
 
+        def _move_cells(self, state: BeamState, use_swap: bool):
+                """
+                Cells worth moving in `state`: a (black, white) pair of cell lists for
+                swaps, or a (rows, cols) pair for flips whose product holds the cells.
+                """
+                violated_rows = [r for r, s in enumerate(state.row_scores) if s > 0]
+                violated_cols = [c for c, s in enumerate(state.col_scores) if s > 0]
+
+                # If perfect heuristic but score > 0 (sanity), force random
+                if not violated_rows and not violated_cols:
+                        violated_rows = list(range(self.height))
+                        violated_cols = list(range(self.width))
+
+                if use_swap:
+                        # Generate SWAP moves (Move Black -> White)
+                        # Cells lying in a violated row or a violated column
+                        in_violation = np.zeros((self.height, self.width), dtype=bool)
+                        in_violation[violated_rows, :] = True
+                        in_violation[:, violated_cols] = True
+
+                        # 1. Find a black cell involved in a violation
+                        is_black = state.board == self.BLACK
+                        candidates_black = self._cells(in_violation & is_black)
+
+                        # 2. Find a white cell involved in a violation
+                        candidates_white = self._cells(in_violation & ~is_black)
+                        return candidates_black, candidates_white
+
+                # Generate FLIP moves (Standard)
+                # Intersect rows and cols to find "hot spots"
+                if not violated_rows or not violated_cols:  # Fallback
+                        return violated_rows, range(self.width)
+                return violated_rows, violated_cols
+
+        def _neighbor_lower_bound(self, state: BeamState) -> int:
+                """
+                Optimistic final score for any neighbor of `state`.
+
+                A move flips at most two cells, so it can only rescore two rows and
+                two columns (at best zeroing them) and shift the black count by two.
+                """
+                max_flips = 2
+                line_gain = sum(heapq.nlargest(max_flips, state.row_scores)) + sum(
+                        heapq.nlargest(max_flips, state.col_scores)
+                )
+                count_diff = abs(state.black_count - self.target_black_count)
+                return max(0, state.heuristic_score - line_gain) + (
+                        max(0, count_diff - max_flips) * self.GLOBAL_COUNT_WEIGHT
+                )
+
         def _evaluate_swap(
                 self, state: BeamState, p1: Tuple[int, int], p2: Tuple[int, int]
         ):
@@ -299,151 +581,167 @@ class LocalBeamSolver(NonogramSolver):
                 # Count remains identical, so new_cnt = old_cnt
                 # We assume p1 is BLACK and p2 is WHITE for logic simplicity
 
-                r1, c1 = p1
-                r2, c2 = p2
-
                 # If they are same color, no change (shouldn't happen by logic above)
-                if state.board[r1][c1] == state.board[r2][c2]:
-                        return (
-                                state.heuristic_score,
-                                state.row_scores,
-                                state.col_scores,
-                                state.black_count,
-                        )
+                if not self._differ_in_color(state, p1, p2):
+                        return state.heuristic_score, (), (), state.black_count
 
                 # Temporary flip both to simulate swap
                 move = [p1, p2]
                 return self._evaluate_flip(state, move)
 
+        @staticmethod
+        def _differ_in_color(state: BeamState, p1, p2) -> bool:
+                """Whether cells p1 and p2 differ, read off the packed rows."""
+                (r1, c1), (r2, c2) = p1, p2
+                return bool(((state.row_bits[r1] >> c1) ^ (state.row_bits[r2] >> c2)) & 1)
+
         def _apply_swap(self, board, p1, p2):
-                new_board = [row[:] for row in board]
+                new_board = board.copy()
                 # Swap values
-                val1 = new_board[p1[0]][p1[1]]
-                val2 = new_board[p2[0]][p2[1]]
-                new_board[p1[0]][p1[1]] = val2
-                new_board[p2[0]][p2[1]] = val1
+                new_board[p1], new_board[p2] = board[p2], board[p1]
                 return new_board
 
         def _evaluate_flip(self, state: BeamState, move: List[Tuple[int, int]]):
-                """Incremental Evaluation."""
-                new_r_scores = list(state.row_scores)
-                new_c_scores = list(state.col_scores)
+                """
+                Incremental Evaluation.
+
+                Returns the new heuristic total, the changed row and column scores
+                as (index, score) pairs, and the new black count.
+                """
+                row_bits = state.row_bits
+                col_bits = state.col_bits
                 new_black_count = state.black_count
 
-                affected_rows = set()
-                affected_cols = set()
+                # XOR masks to apply to each affected row / column
+                row_flips = {}
+                col_flips = {}
 
                 for r, c in move:
-                        affected_rows.add(r)
-                        affected_cols.add(c)
+                        row_flips[r] = row_flips.get(r, 0) ^ (1 << c)
+                        col_flips[c] = col_flips.get(c, 0) ^ (1 << r)
                         # Update black count based on flip
-                        if state.board[r][c] == self.WHITE:
+                        if (row_bits[r] >> c) & 1 == self.WHITE:
                                 new_black_count += 1  # White -> Black
                         else:
                                 new_black_count -= 1  # Black -> White
 
-                for r in affected_rows:
-                        line = list(state.board[r])
-                        for fr, fc in move:
-                                if fr == r:
-                                        line[fc] = (
-                                                self.WHITE
-                                                if line[fc] == self.BLACK
-                                                else self.BLACK
-                                        )
-                        new_r_scores[r] = self._calculate_line_score(line, self.rows[r])
-
-                for c in affected_cols:
-                        line = [state.board[row][c] for row in range(self.height)]
-                        for fr, fc in move:
-                                if fc == c:
-                                        line[fr] = (
-                                                self.WHITE
-                                                if line[fr] == self.BLACK
-                                                else self.BLACK
-                                        )
-                        new_c_scores[c] = self._calculate_line_score(
-                                line, self.columns[c]
-                        )
+                # Only the touched lines change, so adjust the parent's total
+                total = state.heuristic_score
+                row_scorers = self._row_scorers
+                col_scorers = self._col_scorers
+                row_scores = state.row_scores
+                col_scores = state.col_scores
+
+                r_delta = []
+                for r, mask in row_flips.items():
+                        score = row_scorers[r](row_bits[r] ^ mask)
+                        total += score - row_scores[r]
+                        r_delta.append((r, score))
 
-                total = sum(new_r_scores) + sum(new_c_scores)
-                return total, new_r_scores, new_c_scores, new_black_count
+                c_delta = []
+                for c, mask in col_flips.items():
+                        score = col_scorers[c](col_bits[c] ^ mask)
+                        total += score - col_scores[c]
+                        c_delta.append((c, score))
+
+                return total, r_delta, c_delta, new_black_count
 
         def _apply_flip(self, board, move):
-                new_board = [row[:] for row in board]
-                for r, c in move:
-                        new_board[r][c] = (
-                                self.WHITE
-                                if new_board[r][c] == self.BLACK
-                                else self.BLACK
-                        )
+                new_board = board.copy()
+                rs, cs = zip(*move)
+                new_board[rs, cs] ^= 1
                 return new_board
 
+        def _flip_bits(self, state: BeamState, move):
+                """Return the packed rows/columns of `state` with the cells in `move` flipped."""
+                row_bits = list(state.row_bits)
+                col_bits = list(state.col_bits)
+                for r, c in move:
+                        row_bits[r] ^= 1 << c
+                        col_bits[c] ^= 1 << r
+                return row_bits, col_bits
+
         # --- Utilities ---
 
         def _create_state(self, board):
-                r_scores = [
-                        self._calculate_line_score(board[r], self.rows[r])
-                        for r in range(self.height)
+                row_bits = self._pack_lines(board)
+                col_bits = self._pack_lines(board.T)
+                r_scores = [score(bits) for score, bits in zip(self._row_scorers, row_bits)]
+                c_scores = [score(bits) for score, bits in zip(self._col_scorers, col_bits)]
+                black_count = int(board.sum())
+                is_black = board == self.BLACK
+                board_hashes = [
+                        int(np.bitwise_xor.reduce(view[is_black]))
+                        for view in self._zobrist_views
+                ]
+                state = BeamState(
+                        board,
+                        row_bits,
+                        col_bits,
+                        r_scores,
+                        c_scores,
+                        black_count,
+                        board_hashes,
+                )
+                # If count is perfect, score is just heuristic. If not, massive penalty.
+                count_diff = abs(black_count - self.target_black_count)
+                state.final_score = state.heuristic_score + (
+                        count_diff * self.GLOBAL_COUNT_WEIGHT
+                )
+                return state
+
+        def _clue_symmetries(self) -> List[Tuple[int, int]]:
+                """
+                Reflections of the board that map every solution of the clues onto
+                a solution (and keep every score), as (row_step, col_step) slice
+                steps; the identity comes first.
+                """
+                rows = [tuple(clues) for clues in self.rows]
+                cols = [tuple(clues) for clues in self.columns]
+                symmetries = [(1, 1)]
+                for row_step, col_step in ((1, -1), (-1, 1), (-1, -1)):
+                        # Mirroring the columns reverses each row clue and the column
+                        # order, and likewise for rows
+                        mirrored_rows = [clues[::col_step] for clues in rows[::row_step]]
+                        mirrored_cols = [clues[::row_step] for clues in cols[::col_step]]
+                        if mirrored_rows == rows and mirrored_cols == cols:
+                                symmetries.append((row_step, col_step))
+                return symmetries
+
+        @staticmethod
+        def _pack_lines(lines: np.ndarray) -> List[int]:
+                """Pack each 0/1 row of `lines` into an int bitmask (cell i -> bit i)."""
+                packed = np.packbits(lines, axis=1, bitorder="little")
+                width = packed.shape[1]
+                data = packed.tobytes()
+                return [
+                        int.from_bytes(data[i : i + width], "little")
+                        for i in range(0, len(data), width)
                 ]
-                c_scores = []
-                for c in range(self.width):
-                        col_line = [board[r][c] for r in range(self.height)]
-                        c_scores.append(
-                                self._calculate_line_score(col_line, self.columns[c])
-                        )
-                black_count = sum(row.count(self.BLACK) for row in board)
-                return BeamState(board, r_scores, c_scores, black_count)
-
-        def _calculate_line_score(self, line: List[int], clues: List[int]) -> int:
-                line_key = tuple(line)
-                clues_key = tuple(clues)
-                cache_key = (line_key, clues_key)
-                if cache_key in self._score_cache:
-                        return self._score_cache[cache_key]
-
-                runs = []
-                count = 0
-                for cell in line:
-                        if cell == self.BLACK:
-                                count += 1
-                        elif count:
-                                runs.append(count)
-                                count = 0
-                if count:
-                        runs.append(count)
-
-                # Weighted Score
-                # High penalty for wrong number of blocks (structure is wrong)
-                score = abs(len(clues) - len(runs)) * self.RUN_COUNT_WEIGHT
-                # Smaller penalty for wrong lengths (details are wrong)
-                for i in range(min(len(clues), len(runs))):
-                        score += abs(clues[i] - runs[i]) * self.RUN_LENGTH_WEIGHT
-
-                self._score_cache[cache_key] = score
-                return score
 
         def _generate_smart_random_board(self):
                 """Generates a random board that roughly matches the density needed."""
                 total_cells = self.width * self.height
                 target = getattr(self, "target_black_count", total_cells // 2)
                 prob = target / total_cells
-                return [
-                        [1 if random.random() < prob else 0 for _ in range(self.width)]
-                        for _ in range(self.height)
-                ]
+                return (self._rng.random((self.height, self.width)) < prob).astype(
+                        self._board_dtype
+                )
 
         def _perturb_board(self, board):
                 """Flip a small % of cells to escape local optima."""
-                new_board = [row[:] for row in board]
+                new_board = board.copy()
                 num_flips = max(
                         1, int((self.width * self.height) * self.perturbation_ratio)
                 )
-                for _ in range(num_flips):
-                        r = random.randint(0, self.height - 1)
-                        c = random.randint(0, self.width - 1)
-                        new_board[r][c] = 1 - new_board[r][c]
+                rs = self._rng.integers(0, self.height, num_flips)
+                cs = self._rng.integers(0, self.width, num_flips)
+                # XOR through ufunc.at so a cell drawn twice flips twice, as before
+                np.bitwise_xor.at(new_board, (rs, cs), 1)
                 return new_board
 
-        def _hash_board(self, board):
-                return tuple(tuple(row) for row in board)
+        @staticmethod
+        def _cells(mask: np.ndarray) -> List[Tuple[int, int]]:
+                """(row, col) pairs, as plain ints, of the True cells of a boolean board."""
+                rs, cs = np.nonzero(mask)
+                return list(zip(rs.tolist(), cs.tolist()))
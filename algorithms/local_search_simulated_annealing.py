@@ -1,9 +1,28 @@
 import math
+import multiprocessing
+import os
 import random
+from functools import lru_cache
+from itertools import combinations, compress
+from operator import itemgetter
 
 from algorithms.__base__ import NonogramSolver
 
 
+# Solver handed to each pool process once, instead of pickling it per restart
+_restart_solver = None
+
+
+def _init_restart_worker(solver):
+        global _restart_solver
+        _restart_solver = solver
+
+
+def _run_restart(seed):
+        random.seed(seed)
+        return _restart_solver._anneal()
+
+
 class SimulatedAnnealingSolver(NonogramSolver):
         name = "Local Search with Simulated Annealing"
         description = "Simulated annealing with constraint propagation and min-conflict heuristics"
@@ -17,6 +36,9 @@ class SimulatedAnnealingSolver(NonogramSolver):
                 repair_interval=60,
                 reheat_interval=2500,
                 mutation_samples=5,
+                restart_from_best=False,
+                no_improve=None,
+                workers=1,
         ):
                 self.max_steps = max_steps
                 self.max_restarts = max_restarts
@@ -25,20 +47,37 @@ class SimulatedAnnealingSolver(NonogramSolver):
                 self.repair_interval = repair_interval
                 self.reheat_interval = reheat_interval
                 self.mutation_samples = mutation_samples
+                # Sequential restarts start from a perturbed copy of the best state so
+                # far instead of from scratch
+                self.restart_from_best = restart_from_best
+                # End a run after this many steps without a new best cost, leaving its
+                # steps to further sequential restarts (None: runs go full length)
+                self.no_improve = no_improve
+                # Processes to spread the restarts over (1 runs them in this process,
+                # None uses one per CPU)
+                self.workers = workers
 
         def _solve_internal(self):
-                # 1. Generate initial domains
-                self.row_patterns = [
-                        self._generate_patterns(self.width, clues)
-                        for clues in self.rows
-                ]
+                # 1. Generate initial domains; row_exact[r] is False when row r's
+                # domain is only a sample of its layouts
+                self.row_patterns, self.row_exact = self._line_domains(
+                        self.width, self.rows
+                )
                 # Generate column patterns solely for logical pruning
-                self.col_patterns = [
-                        self._generate_patterns(self.height, clues)
-                        for clues in self.columns
-                ]
+                self.col_patterns, self.col_exact = self._line_domains(
+                        self.height, self.columns
+                )
 
                 self.column_targets = [sum(clues) for clues in self.columns]
+                self.column_lens = [len(clues) for clues in self.columns]
+                # End clues, 0 for an empty column so any block there counts as excess
+                self.column_first = [clues[0] if clues else 0 for clues in self.columns]
+                self.column_last = [clues[-1] if clues else 0 for clues in self.columns]
+                # Fixed surcharge for columns whose clues cannot fit at all
+                self.column_penalties = [
+                        max(0, target + max(0, n - 1) - self.height) * 10
+                        for target, n in zip(self.column_targets, self.column_lens)
+                ]
                 self.total_required = sum(self.column_targets)
 
                 # 2. LOGICAL PREPROCESSING: Prune the search space
@@ -50,162 +89,352 @@ class SimulatedAnnealingSolver(NonogramSolver):
                                 "Puzzle proven impossible during preprocessing."
                         )
 
-                for _ in range(self.max_restarts):
-                        state = self._biased_initial_state()
-                        cost = self._column_cost(state)
+                # Per row pattern: a getter for its filled columns' sums and their
+                # summed targets, which is all _guided_selection needs to rank it
+                self.row_pattern_fills = [
+                        [self._pattern_fill(p) for p in patterns]
+                        for patterns in self.row_patterns
+                ]
 
-                        if cost == 0:
+                # Lowest-cost state any run has reached, kept by _anneal
+                self._best_state = None
+                self._best_cost = math.inf
+
+                workers = self.workers or os.cpu_count() or 1
+                if (
+                        workers > 1
+                        and self.max_restarts > 1
+                        and not multiprocessing.current_process().daemon
+                ):
+                        # Most puzzles fall to the first run, so only pay for the
+                        # pool once that has failed
+                        state = self._anneal()
+                        if state is None:
+                                state = self._parallel_restarts(
+                                        self.max_restarts - 1, workers
+                                )
+                        if state is not None:
                                 return state
+                else:
+                        # A failed run spends max_steps unless no_improve cuts it short,
+                        # so this is max_restarts runs at full length
+                        steps_left = self.max_steps * self.max_restarts
+                        while steps_left > 0:
+                                state = self._anneal(self._restart_state())
+                                if state is not None:
+                                        return state
+                                steps_left -= self._run_steps
 
-                        T = self.temperature
+                raise RuntimeError("Local search failed to find a solution")
 
-                        # Track current column sums for fast heuristic updates
-                        # (used by guided mutation)
-                        current_col_sums = [
-                                sum(state[r][c] for r in range(self.height))
-                                for c in range(self.width)
-                        ]
+        def _parallel_restarts(self, restarts, workers):
+                """
+                Run `restarts` independent restarts on a pool of `workers` processes,
+                each from its own seed, and return the first solved state (None if
+                none solves).
+                Daemonic processes (e.g. the UI worker) cannot have children, so the
+                caller falls back to sequential restarts there.
+                """
+                seeds = [random.getrandbits(64) for _ in range(restarts)]
+                with multiprocessing.Pool(
+                        min(workers, restarts), initializer=_init_restart_worker, initargs=(self,)
+                ) as pool:
+                        # Leaving the block terminates restarts still running
+                        for state in pool.imap_unordered(_run_restart, seeds):
+                                if state is not None:
+                                        return state
+                return None
 
-                        for step in range(self.max_steps):
-                                if step % self.reheat_interval == 0:
-                                        T = self.temperature
-
-                                # Periodically fix the worst column entirely
-                                if step % self.repair_interval == 0:
-                                        col = self._most_violated_column(state)
-                                        self._repair_column(state, col)
-                                        # Recompute sums after heavy repair
-                                        current_col_sums = [
-                                                sum(
-                                                        state[r][c]
-                                                        for r in range(self.height)
-                                                )
-                                                for c in range(self.width)
-                                        ]
-                                        cost = self._column_cost(state)
-
-                                bad_rows = self._conflicting_rows(state)
-                                row = (
-                                        random.choice(bad_rows)
-                                        if bad_rows
-                                        else random.randrange(self.height)
+        def _restart_state(self):
+                """
+                Where the next sequential run starts: the best state so far with a
+                few rows redrawn, or None for a fresh initial state.
+                """
+                if not self.restart_from_best or self._best_state is None:
+                        return None
+                state = list(self._best_state)
+                for _ in range(max(3, self.height // 5)):
+                        r = random.randrange(self.height)
+                        state[r] = random.choice(self.row_patterns[r])
+                return state
+
+        def _anneal(self, start=None):
+                """
+                One annealing run from `start` (a fresh initial state if None); the
+                solved state or None. Records the run's best state for _restart_state
+                and the steps it used in _run_steps.
+                """
+                state = self._biased_initial_state() if start is None else start
+                # Column cost by packed mask, per column; a run revisits the same
+                # few masks constantly, and restarting drops the table to bound memory
+                self._column_cost_memo = [{} for _ in range(self.width)]
+
+                # Track current column sums for fast heuristic updates
+                # (used by guided mutation)
+                current_col_sums = [sum(column) for column in zip(*state)]
+                # Columns packed as ints (bit r <=> row r filled) and their costs,
+                # so a row change only rescores the columns it touches
+                col_bits = self._column_bits(state)
+                col_costs = self._mask_costs(col_bits)
+                filled = sum(current_col_sums)
+                cost = sum(col_costs) + abs(filled - self.total_required)
+                # Per row, how many violated columns it has a filled cell in
+                # (a column is satisfied exactly when its cost is 0)
+                conflicts = self._conflict_counts(state, col_costs)
+
+                if cost == 0:
+                        return state
+                best_state, best_cost = list(state), cost
+
+                def commit(row, new_pattern, changed, new_col_costs):
+                        # Install an accepted row change and fold it into the caches
+                        old_pattern = state[row]
+                        state[row] = new_pattern
+                        row_bit = 1 << row
+                        for c, col_cost in zip(changed, new_col_costs):
+                                self._update_conflicts(
+                                        state,
+                                        conflicts,
+                                        row,
+                                        c,
+                                        old_pattern[c],
+                                        col_costs[c] > 0,
+                                        col_cost > 0,
                                 )
+                                col_costs[c] = col_cost
+                                col_bits[c] ^= row_bit
+                                # Update column sums to keep heuristic accurate
+                                current_col_sums[c] += new_pattern[c] - old_pattern[c]
+
+                # T is floored where it changes rather than in every acceptance test
+                T0 = max(self.temperature, 1e-6)
+                T = T0
+                rand, exp = random.random, math.exp
+                rows = range(self.height)
+                since_improve = 0
+                self._run_steps = self.max_steps
+
+                for step in range(self.max_steps):
+                        if step % self.reheat_interval == 0:
+                                T = T0
+
+                        # Periodically fix the worst column entirely
+                        if step % self.repair_interval == 0:
+                                col = self._most_violated_column(col_bits)
+                                repair = self._repair_column(
+                                        state, col, col_bits, col_costs, filled
+                                )
+                                if repair is not None:
+                                        r, pattern, (changed, new_col_costs, new_filled, delta) = (
+                                                repair
+                                        )
+                                        commit(r, pattern, changed, new_col_costs)
+                                        filled = new_filled
+                                        cost += delta
+
+                        bad_rows = list(compress(rows, conflicts))
+                        # Scaling random() is cheaper than choice()/randrange()
+                        row = (
+                                bad_rows[int(rand() * len(bad_rows))]
+                                if bad_rows
+                                else int(rand() * self.height)
+                        )
 
-                                old_pattern = state[row]
+                        # 3. GUIDED MUTATION: Pick 'best of k' instead of random
+                        new_pattern = self._guided_selection(
+                                row, current_col_sums
+                        )
 
-                                # 3. GUIDED MUTATION: Pick 'best of k' instead of random
-                                new_pattern = self._guided_selection(
-                                        row, current_col_sums
-                                )
+                        changed, new_col_costs, new_filled, delta = self._row_change(
+                                state, row, new_pattern, col_bits, col_costs, filled
+                        )
 
-                                state[row] = new_pattern
-                                new_cost = self._column_cost(state)
-                                delta = new_cost - cost
-
-                                if delta <= 0 or random.random() < math.exp(
-                                        -delta / max(T, 1e-6)
-                                ):
-                                        cost = new_cost
-                                        # Update column sums to keep heuristic accurate
-                                        for c in range(self.width):
-                                                current_col_sums[c] += (
-                                                        new_pattern[c] - old_pattern[c]
-                                                )
-                                else:
-                                        state[row] = old_pattern  # Revert
-
-                                if cost == 0:
-                                        return state
+                        if delta <= 0 or rand() < exp(-delta / T):
+                                commit(row, new_pattern, changed, new_col_costs)
+                                filled = new_filled
+                                cost += delta
 
-                                T *= self.cooling
+                        if cost == 0:
+                                return state
+                        if cost < best_cost:
+                                best_state, best_cost = list(state), cost
+                                since_improve = 0
+                        else:
+                                since_improve += 1
+                                if self.no_improve and since_improve > self.no_improve:
+                                        self._run_steps = step + 1
+                                        break
 
-                raise RuntimeError("Local search failed to find a solution")
+                        T = max(T * self.cooling, 1e-6)
+
+                if best_cost < self._best_cost:
+                        self._best_state, self._best_cost = best_state, best_cost
+                return None
+
+        def _row_change(self, state, row, pattern, col_bits, col_costs, filled):
+                """
+                Evaluate replacing state[row] by `pattern` without applying it.
+                Only columns where the row actually changes are rescored; returns
+                them with their new costs, the new filled count and the cost delta.
+                """
+                old_pattern = state[row]
+                changed = [c for c in range(self.width) if pattern[c] != old_pattern[c]]
+                row_bit = 1 << row
+                new_col_costs = [
+                        self._mask_column_cost(col_bits[c] ^ row_bit, c) for c in changed
+                ]
+                new_filled = filled + sum(pattern[c] - old_pattern[c] for c in changed)
+                delta = (
+                        sum(new_col_costs)
+                        - sum(col_costs[c] for c in changed)
+                        + abs(new_filled - self.total_required)
+                        - abs(filled - self.total_required)
+                )
+                return changed, new_col_costs, new_filled, delta
 
         def _logical_pruning(self):
                 """
                 Iteratively intersects patterns to find fixed cells (must be 0 or must be 1).
                 Uses these fixed cells to remove invalid patterns from domains.
+                Works on bitmasks: each line keeps masks of its cells fixed to 1 and
+                to 0, so checking a pattern is two ANDs and the cells all remaining
+                patterns agree on fall out of an AND/OR over the domain.
+
+                Only exact domains are pruned or deduced from. A sampled domain is
+                redrawn from the layouts that fit the line's fixed cells whenever
+                those change, and becomes exact once few enough of them remain.
                 """
-                fixed_board = [[-1] * self.width for _ in range(self.height)]
+                row_masks = [self._pattern_masks(p) for p in self.row_patterns]
+                col_masks = [self._pattern_masks(p) for p in self.col_patterns]
+                # Bit c of row_ones[r] <=> cell (r, c) fixed to 1; columns use bit r
+                row_ones, row_zeros = [0] * self.height, [0] * self.height
+                col_ones, col_zeros = [0] * self.width, [0] * self.width
+                # Fixed cells each sampled line was last drawn under
+                row_drawn = [(0, 0)] * self.height
+                col_drawn = [(0, 0)] * self.width
                 changed = True
 
                 while changed:
-                        changed = False
-
                         # --- ROW PASS ---
-                        for r in range(self.height):
-                                possible = self.row_patterns[r]
-                                if not possible:
-                                        continue
+                        changed = self._prune_lines(
+                                self.row_patterns,
+                                row_masks,
+                                self.row_exact,
+                                row_ones,
+                                row_zeros,
+                                col_ones,
+                                col_zeros,
+                                self.width,
+                        )
+                        # --- COLUMN PASS ---
+                        changed |= self._prune_lines(
+                                self.col_patterns,
+                                col_masks,
+                                self.col_exact,
+                                col_ones,
+                                col_zeros,
+                                row_ones,
+                                row_zeros,
+                                self.height,
+                        )
+                        # --- SAMPLED LINES ---
+                        changed |= self._redraw_sampled(
+                                self.row_patterns,
+                                row_masks,
+                                self.row_exact,
+                                row_drawn,
+                                self.rows,
+                                row_ones,
+                                row_zeros,
+                                self.width,
+                        )
+                        changed |= self._redraw_sampled(
+                                self.col_patterns,
+                                col_masks,
+                                self.col_exact,
+                                col_drawn,
+                                self.columns,
+                                col_ones,
+                                col_zeros,
+                                self.height,
+                        )
 
-                                # Filter based on current fixed board knowledge
-                                filtered = []
-                                for p in possible:
-                                        valid = True
-                                        for c in range(self.width):
-                                                if (
-                                                        fixed_board[r][c] != -1
-                                                        and fixed_board[r][c] != p[c]
-                                                ):
-                                                        valid = False
-                                                        break
-                                        if valid:
-                                                filtered.append(p)
-
-                                if len(filtered) < len(possible):
-                                        self.row_patterns[r] = filtered
-                                        changed = True
-                                        possible = filtered
-
-                                # Deduce new fixed cells from remaining patterns
-                                # If all patterns have 1 at pos c, then board[r][c] is 1.
-                                if possible:
-                                        for c in range(self.width):
-                                                if fixed_board[r][c] == -1:
-                                                        val = possible[0][c]
-                                                        if all(
-                                                                pat[c] == val
-                                                                for pat in possible
-                                                        ):
-                                                                fixed_board[r][c] = val
-                                                                changed = True
+        def _redraw_sampled(
+                self, patterns, masks, exact, drawn, clues, ones, zeros, length
+        ):
+                """
+                Redraw each sampled line whose fixed cells changed since its last
+                draw. Returns whether a line became exact, giving the next pass
+                something new to deduce from.
+                """
+                changed = False
+                for i, line_exact in enumerate(exact):
+                        fixed = (ones[i], zeros[i])
+                        if line_exact or drawn[i] == fixed:
+                                continue
+                        drawn[i] = fixed
+                        patterns[i], exact[i] = self._line_domain(length, clues[i], *fixed)
+                        masks[i] = self._pattern_masks(patterns[i])
+                        changed |= exact[i]
+                return changed
+
+        @staticmethod
+        def _prune_lines(
+                patterns, masks, exact, ones, zeros, cross_ones, cross_zeros, length
+        ):
+                """
+                One pruning pass over a set of parallel lines: drop patterns that
+                contradict fixed cells, then fix the cells all survivors agree on,
+                mirroring them into the crossing lines. Lines whose domain is only a
+                sample are skipped. Returns whether anything changed.
+                """
+                full = (1 << length) - 1
+                changed = False
+                for i, line_masks in enumerate(masks):
+                        if not line_masks or not exact[i]:
+                                continue
+                        line_ones, line_zeros = ones[i], zeros[i]
 
-                        # --- COLUMN PASS ---
-                        for c in range(self.width):
-                                possible = self.col_patterns[c]
-                                if not possible:
+                        # Filter based on current fixed board knowledge
+                        keep = [
+                                k
+                                for k, m in enumerate(line_masks)
+                                if m & line_zeros == 0 and m & line_ones == line_ones
+                        ]
+                        if len(keep) < len(line_masks):
+                                patterns[i] = [patterns[i][k] for k in keep]
+                                line_masks = masks[i] = [line_masks[k] for k in keep]
+                                changed = True
+                                if not line_masks:
                                         continue
 
-                                # Filter based on current fixed board knowledge
-                                filtered = []
-                                for p in possible:
-                                        valid = True
-                                        for r in range(self.height):
-                                                if (
-                                                        fixed_board[r][c] != -1
-                                                        and fixed_board[r][c] != p[r]
-                                                ):
-                                                        valid = False
-                                                        break
-                                        if valid:
-                                                filtered.append(p)
-
-                                if len(filtered) < len(possible):
-                                        self.col_patterns[c] = filtered
-                                        changed = True
-                                        possible = filtered
-
-                                # Deduce new fixed cells
-                                if possible:
-                                        for r in range(self.height):
-                                                if fixed_board[r][c] == -1:
-                                                        val = possible[0][r]
-                                                        if all(
-                                                                pat[r] == val
-                                                                for pat in possible
-                                                        ):
-                                                                fixed_board[r][c] = val
-                                                                changed = True
+                        # Deduce new fixed cells from remaining patterns
+                        # If all patterns have 1 at pos c, then the cell is 1.
+                        and_all = or_all = line_masks[0]
+                        for m in line_masks:
+                                and_all &= m
+                                or_all |= m
+                        new_ones = and_all & ~line_ones
+                        new_zeros = ~or_all & full & ~line_zeros
+                        if new_ones or new_zeros:
+                                ones[i] = line_ones | new_ones
+                                zeros[i] = line_zeros | new_zeros
+                                changed = True
+                                bit = 1 << i
+                                for new, cross in ((new_ones, cross_ones), (new_zeros, cross_zeros)):
+                                        while new:
+                                                low = new & -new
+                                                cross[low.bit_length() - 1] |= bit
+                                                new ^= low
+                return changed
+
+        @staticmethod
+        def _pattern_masks(patterns):
+                """Each pattern packed into an int, bit i set <=> cell i filled."""
+                if not patterns:
+                        return []
+                weights = [1 << i for i in range(len(patterns[0]))]
+                return [sum(compress(weights, p)) for p in patterns]
 
         def _guided_selection(self, row_idx, current_col_sums):
                 """
@@ -213,154 +442,271 @@ class SimulatedAnnealingSolver(NonogramSolver):
                 Uses a random sample (size k) to avoid scanning huge domains every step.
                 """
                 candidates = self.row_patterns[row_idx]
+                fills = self.row_pattern_fills[row_idx]
 
                 # If domain is small, check all. If large, sample 'mutation_samples'
                 if len(candidates) > self.mutation_samples:
-                        selection_pool = random.sample(
-                                candidates, self.mutation_samples
+                        selection_pool = self._sample_indices(
+                                len(candidates), self.mutation_samples
                         )
                 else:
-                        selection_pool = candidates
+                        selection_pool = range(len(candidates))
 
-                best_p = selection_pool[0]
+                best_i = selection_pool[0]
                 best_score = float("inf")
 
                 # Heuristic: difference in column sums.
                 # Avoids the expensive full _column_cost calculation.
-                for p in selection_pool:
-                        # Score = sum of how far the new column sums would be from targets
-                        # We want column_sum == target.
-                        score = 0
-                        for c in range(self.width):
-                                # Predict new sum: current_sum - old_bit + new_bit
-
-                                diff = self.column_targets[c] - current_col_sums[c]
-                                # If diff > 0, we need more 1s. If p[c] is 1, good.
-                                # If diff < 0, we have too many 1s. If p[c] is 0, good.
-                                if p[c] == 1:
-                                        score += -diff  # Reward if we need ones (diff positive), punish if we don't
-                                else:
-                                        score += diff  # Opposite
-
+                # Summed over all columns, sum(target - current) is the same for every
+                # pattern; each filled cell then flips its column's term, so patterns
+                # rank by how far over target their filled columns already are.
+                for i in selection_pool:
+                        gather, target = fills[i]
+                        score = sum(gather(current_col_sums)) - target
                         if score < best_score:
                                 best_score = score
-                                best_p = p
+                                best_i = i
+
+                return candidates[best_i]
+
+        @staticmethod
+        def _sample_indices(n, k):
+                """k distinct indices below n (k < n), in draw order."""
+                # Rejection is far cheaper than random.sample for a few picks from
+                # a large domain; guided selection only ever asks for k < n
+                picked = []
+                while len(picked) < k:
+                        i = int(random.random() * n)
+                        if i not in picked:
+                                picked.append(i)
+                return picked
+
+        def _pattern_fill(self, pattern):
+                """
+                A getter pulling the pattern's filled columns out of the column sums,
+                and the summed targets of those columns.
+                """
+                ones = [c for c, cell in enumerate(pattern) if cell]
+                if len(ones) > 1:
+                        gather = itemgetter(*ones)
+                else:
+                        # A single index would make itemgetter return a bare int
+                        gather = itemgetter(slice(ones[0], ones[0] + 1) if ones else slice(0))
+                return gather, sum(self.column_targets[c] for c in ones)
 
-                return best_p
+        def _line_domains(self, length, lines):
+                """(patterns, exact) lists for every line's clues; see _line_domain."""
+                domains = [self._line_domain(length, clues) for clues in lines]
+                return [d[0] for d in domains], [d[1] for d in domains]
 
-        def _generate_patterns(self, length, clues):
+        def _line_domain(self, length, clues, ones=0, zeros=0):
+                """
+                The layouts of clues that fill every cell in the bitmask ones and no
+                cell in zeros, and whether that list is all of them (exact) or, past
+                MAX_PATTERNS, a uniform sample that must not be pruned or deduced from.
+                """
+                MAX_PATTERNS = 5000
                 if not clues:
-                        return [[0] * length]
+                        return ([[0] * length] if not ones else []), True
+
+                counts = self._placement_counts(length, clues, ones, zeros)
+                total = counts[0][0]
+                if total > MAX_PATTERNS:
+                        # Too many to list: take a uniform sample rather than the
+                        # lexicographically first ones, which all crowd to the left
+                        ranks = set()
+                        while len(ranks) < MAX_PATTERNS:
+                                ranks.add(random.randrange(total))
+                        return [
+                                self._unrank_pattern(length, clues, counts, rank, ones, zeros)
+                                for rank in sorted(ranks)
+                        ], False
+
+                if ones or zeros:
+                        return [
+                                self._unrank_pattern(length, clues, counts, rank, ones, zeros)
+                                for rank in range(total)
+                        ], True
+
+                # Stars and bars: choose which of the slots hold a block; block k then
+                # starts at its slot index shifted by the lengths of earlier blocks.
+                # Combinations come out in the same left-to-right order as unranking.
+                offsets = [sum(clues[:k]) for k in range(len(clues))]
+                paint = [(offset, [1] * block) for offset, block in zip(offsets, clues)]
                 patterns = []
-                MAX_PATTERNS = 5000
-
-                def backtrack(pos, idx, current):
-                        if len(patterns) >= MAX_PATTERNS:
-                                return
-                        if idx == len(clues):
-                                patterns.append(current + [0] * (length - pos))
-                                return
+                for slots in combinations(range(length - sum(clues) + 1), len(clues)):
+                        pattern = [0] * length
+                        for slot, (offset, run) in zip(slots, paint):
+                                start = slot + offset
+                                pattern[start : start + len(run)] = run
+                        patterns.append(pattern)
+                return patterns, True
+
+        @staticmethod
+        def _placement_counts(length, clues, ones=0, zeros=0):
+                """
+                counts[idx][pos]: ways to place clues[idx:] in cells pos.. of the line,
+                filling every cell of ones and none of zeros there (bit i = cell i).
+                pos runs to length + 1, one past the separator after a block at the end.
+                """
+                k = len(clues)
+                # Nothing left to place: the rest of the line is empty
+                tail = [0 if ones >> pos else 1 for pos in range(length + 1)] + [1]
+                counts = [[0] * (length + 2) for _ in range(k)] + [tail]
+                for idx in range(k - 1, -1, -1):
                         block = clues[idx]
-                        for start in range(pos, length - block + 1):
-                                new = current + [0] * (start - pos) + [1] * block
-                                if start + block < length:
-                                        backtrack(start + block + 1, idx + 1, new + [0])
-                                else:
-                                        backtrack(start + block, idx + 1, new)
-
-                backtrack(0, 0, [])
-                return patterns
+                        run = (1 << block) - 1
+                        here, after = counts[idx], counts[idx + 1]
+                        for pos in range(length - block, -1, -1):
+                                # Block starts at pos (no empty cell under it, no
+                                # filled separator after it), or further right past
+                                # an empty cell pos
+                                fits = not zeros >> pos & run and not ones >> (pos + block) & 1
+                                here[pos] = (after[pos + block + 1] if fits else 0) + (
+                                        0 if ones >> pos & 1 else here[pos + 1]
+                                )
+                return counts
+
+        @staticmethod
+        def _unrank_pattern(length, clues, counts, rank, ones=0, zeros=0):
+                """The rank-th pattern in _line_domain's enumeration order."""
+                pattern = [0] * length
+                pos = 0
+                for idx, block in enumerate(clues):
+                        after = counts[idx + 1]
+                        run = (1 << block) - 1
+                        start = pos
+                        while True:
+                                # counts already rules out layouts that skip a filled
+                                # cell; a block must still fit where it starts
+                                fits = not zeros >> start & run and not ones >> (start + block) & 1
+                                ways = after[start + block + 1] if fits else 0
+                                if rank < ways:
+                                        break
+                                rank -= ways
+                                start += 1
+                        pattern[start : start + block] = [1] * block
+                        pos = start + block + 1
+                return pattern
 
         def _biased_initial_state(self):
-                state = []
-                col_counts = [0] * self.width
-                for r in range(self.height):
-                        # Pick random from filtered list because the list is now "smart"
-                        chosen = random.choice(self.row_patterns[r])
-                        state.append(chosen)
-                        for c in range(self.width):
-                                col_counts[c] += chosen[c]
-                return state
+                # Pick random from filtered list because the list is now "smart"
+                return [random.choice(patterns) for patterns in self.row_patterns]
 
         def _column_cost(self, state):
-                cost = 0
-                total_filled = 0
-                for c, clues in enumerate(self.columns):
-                        column = [state[r][c] for r in range(self.height)]
-                        blocks = self._extract_blocks(column)
-                        filled = sum(column)
-                        total_filled += filled
-                        target = sum(clues)
-                        cost += abs(filled - target) * 3
-                        cost += abs(len(blocks) - len(clues)) * 4
-                        for a, b in zip(blocks, clues):
-                                cost += max(0, a - b)
-                                cost += abs(a - b)
-                        if len(blocks) > len(clues):
-                                cost += sum(blocks[len(clues) :]) * 2
-                        transitions = sum(
-                                column[i] != column[i + 1]
-                                for i in range(len(column) - 1)
-                        )
-                        cost += max(0, transitions - 2 * len(clues))
-                        if blocks:
-                                cost += max(0, blocks[0] - clues[0])
-                                cost += max(0, blocks[-1] - clues[-1])
-                        required = sum(clues) + max(0, len(clues) - 1)
-                        cost += max(0, required - self.height) * 10
-                cost += abs(total_filled - self.total_required)
+                total_filled = sum(sum(row) for row in state)
+                return sum(self._column_costs(state)) + abs(
+                        total_filled - self.total_required
+                )
+
+        def _column_costs(self, state):
+                return self._mask_costs(self._column_bits(state))
+
+        def _column_bits(self, state):
+                """Pack each column into an int, bit r set <=> state[r][c] == 1."""
+                # zip(*state) transposes the whole board in one C-level pass
+                return self._pattern_masks(list(zip(*state)))
+
+        def _mask_costs(self, col_bits):
+                return [self._mask_column_cost(mask, c) for c, mask in enumerate(col_bits)]
+
+        def _mask_column_cost(self, mask, c):
+                """Cost of the column packed in `mask`; _column_cost adds the global fill term."""
+                memo = self._column_cost_memo[c]
+                cost = memo.get(mask)
+                if cost is None:
+                        cost = memo[mask] = self._score_column_mask(mask, c)
                 return cost
 
-        def _conflicting_rows(self, state):
-                bad = set()
-                for c, clues in enumerate(self.columns):
-                        column = [state[r][c] for r in range(self.height)]
-                        if self._extract_blocks(column) == clues:
-                                continue
+        def _score_column_mask(self, mask, c):
+                clues = self.columns[c]
+                n_clues = self.column_lens[c]
+                target = self.column_targets[c]
+                blocks = self._mask_blocks(mask)
+                n_blocks = len(blocks)
+                cost = abs(sum(blocks) - target) * 3
+                cost += abs(n_blocks - n_clues) * 4
+                for a, b in zip(blocks, clues):
+                        cost += max(0, a - b)
+                        cost += abs(a - b)
+                if n_blocks > n_clues:
+                        cost += sum(blocks[n_clues:]) * 2
+                # Every block adds two colour changes, minus those cut off by the ends
+                transitions = (
+                        2 * n_blocks - (mask & 1) - ((mask >> (self.height - 1)) & 1)
+                )
+                cost += max(0, transitions - 2 * n_clues)
+                if blocks:
+                        cost += max(0, blocks[0] - self.column_first[c])
+                        cost += max(0, blocks[-1] - self.column_last[c])
+                return cost + self.column_penalties[c]
+
+        @staticmethod
+        @lru_cache(maxsize=1 << 16)
+        def _mask_blocks(mask):
+                """
+                Run lengths of set bits, lowest first; ~2 int ops per block.
+                Shared across solves (a pure function of the mask), hence the tuple.
+                """
+                blocks = []
+                while mask:
+                        # Drop the trailing zeros, then measure the trailing ones
+                        mask >>= (mask & -mask).bit_length() - 1
+                        run = (mask ^ (mask + 1)).bit_length() - 1
+                        blocks.append(run)
+                        mask >>= run
+                return tuple(blocks)
+
+        def _conflict_counts(self, state, col_costs):
+                conflicts = [0] * self.height
+                for c in range(self.width):
+                        if col_costs[c] > 0:
+                                for r in range(self.height):
+                                        conflicts[r] += state[r][c]
+                return conflicts
+
+        def _update_conflicts(self, state, conflicts, row, c, old_cell, was_bad, is_bad):
+                """
+                Adjust conflict counts after cell (row, c) changed from old_cell.
+                Only a column whose violated status flips touches the other rows.
+                """
+                if was_bad and is_bad:
+                        conflicts[row] += state[row][c] - old_cell
+                elif was_bad != is_bad:
+                        sign = 1 if is_bad else -1
                         for r in range(self.height):
-                                if state[r][c] == 1:
-                                        bad.add(r)
-                return list(bad)
+                                cell = old_cell if r == row and was_bad else state[r][c]
+                                conflicts[r] += sign * cell
 
-        def _most_violated_column(self, state):
+        def _most_violated_column(self, col_bits):
                 worst_col = 0
                 worst_cost = -1
-                for c, clues in enumerate(self.columns):
-                        column = [state[r][c] for r in range(self.height)]
-                        cost = abs(sum(column) - sum(clues)) + abs(
-                                len(self._extract_blocks(column)) - len(clues)
+                for c in range(self.width):
+                        blocks = self._mask_blocks(col_bits[c])
+                        cost = abs(sum(blocks) - self.column_targets[c]) + abs(
+                                len(blocks) - self.column_lens[c]
                         )
                         if cost > worst_cost:
                                 worst_cost = cost
                                 worst_col = c
                 return worst_col
 
-        def _repair_column(self, state, col):
+        def _repair_column(self, state, col, col_bits, col_costs, filled):
+                """
+                Best cost-lowering pattern for a random row, as (row, pattern,
+                _row_change result), or None if no sampled pattern improves.
+                """
                 r = random.randrange(self.height)
-                best_row = state[r]
-                best_cost = self._column_cost(state)
+                best = None
+                best_delta = 0
                 # Check all filtered patterns, or a subset if still large
                 domain = self.row_patterns[r]
                 if len(domain) > 20:
                         domain = random.sample(domain, 20)
 
                 for pattern in domain:
-                        state[r] = pattern
-                        cost = self._column_cost(state)
-                        if cost < best_cost:
-                                best_cost = cost
-                                best_row = pattern
-                state[r] = best_row
-
-        def _extract_blocks(self, line):
-                blocks = []
-                count = 0
-                for cell in line:
-                        if cell == 1:
-                                count += 1
-                        elif count > 0:
-                                blocks.append(count)
-                                count = 0
-                if count > 0:
-                        blocks.append(count)
-                return blocks
+                        change = self._row_change(state, r, pattern, col_bits, col_costs, filled)
+                        if change[3] < best_delta:
+                                best_delta = change[3]
+                                best = (r, pattern, change)
+                return best
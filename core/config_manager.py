@@ -3,6 +3,63 @@ import os
 from pathlib import Path
 
 
+def _format_config(value, level=0):
+        """
+        Serialize `value` as indented JSON, except that lists stay on a single
+        line (clue arrays read as "[1, 2]"), without a regex pass afterwards.
+        """
+        if not isinstance(value, dict) or not value:
+                return json.dumps(value, ensure_ascii=False)
+        indent = "  " * (level + 1)
+        items = [
+                f"{indent}{json.dumps(str(key), ensure_ascii=False)}: "
+                + _format_config(item, level + 1)
+                for key, item in value.items()
+        ]
+        return "{\n" + ",\n".join(items) + "\n" + "  " * level + "}"
+
+
+def _copy_config(config):
+        """
+        Copy of a config down to its clue lists, the deepest level callers edit;
+        much cheaper than copy.deepcopy, which costs more than re-parsing.
+        """
+        return {
+                key: (
+                        [list(clues) for clues in value]
+                        if key in ("rows", "columns")
+                        else value
+                )
+                for key, value in config.items()
+        }
+
+
+def _clue_lists(clues, count):
+        """
+        The clue lists of `count` lines, by position, from a config file's
+        {"0": [...], "1": [...]} table (a plain list is accepted as well).
+        """
+        if isinstance(clues, dict):
+                return [clues.get(str(i), []) for i in range(count)]
+        clues = [list(line) for line in clues[:count]]
+        return clues + [[] for _ in range(count - len(clues))]
+
+
+def _config_from_json(data):
+        """In-memory form of a parsed config: clues as lists indexed by line."""
+        data["rows"] = _clue_lists(data.get("rows", {}), data.get("height", 0))
+        data["columns"] = _clue_lists(data.get("columns", {}), data.get("width", 0))
+        return data
+
+
+def _config_to_json(config):
+        """File form of a config: clue tables keyed by the stringified index."""
+        data = dict(config)
+        for key in ("rows", "columns"):
+                data[key] = {str(i): clues for i, clues in enumerate(config[key])}
+        return data
+
+
 class ConfigManager:
         """Manages nonogram puzzle configurations. Automatically save/load configurations."""
 
@@ -10,14 +67,15 @@ class ConfigManager:
         DEFAULT_WIDTH = 4
         DEFAULT_HEIGHT = 4
 
+        # Parsed configs by absolute path, with the (mtime_ns, size) they were
+        # read or written at; shared by all instances
+        _load_cache = {}
+
         def __init__(self, config_file=None):
                 self.config_file = config_file or self.DEFAULT_CONFIG_FILE
-                self.config = {
-                        "width": self.DEFAULT_WIDTH,
-                        "height": self.DEFAULT_HEIGHT,
-                        "rows": {},
-                        "columns": {},
-                }
+                # Clues are kept as lists indexed by line; the string-keyed tables
+                # of the file format only exist at the JSON boundary
+                self.config = {"width": 0, "height": 0, "rows": [], "columns": []}
                 self.set_dimensions(self.DEFAULT_WIDTH, self.DEFAULT_HEIGHT)
 
         def ensure_startup_config(self):
@@ -25,12 +83,7 @@ class ConfigManager:
                 config_path = Path(self.config_file)
                 if config_path.exists():
                         return
-                self.config = {
-                        "width": self.DEFAULT_WIDTH,
-                        "height": self.DEFAULT_HEIGHT,
-                        "rows": {},
-                        "columns": {},
-                }
+                self.config = {"width": 0, "height": 0, "rows": [], "columns": []}
                 self.set_dimensions(self.DEFAULT_WIDTH, self.DEFAULT_HEIGHT)
                 self.save_config()
 
@@ -39,8 +92,17 @@ class ConfigManager:
                 file_to_load = filepath or self.config_file
                 if os.path.exists(file_to_load):
                         try:
-                                with open(file_to_load, "r") as f:
-                                        self.config = json.load(f)
+                                path, stamp = self._file_stamp(file_to_load)
+                                cached = self._load_cache.get(path)
+                                if cached is not None and cached[0] == stamp:
+                                        # Unchanged since last read: skip the parse. Callers
+                                        # edit self.config in place, hence the copy.
+                                        self.config = _copy_config(cached[1])
+                                        return True
+                                # One read of the whole file; json.loads decodes the bytes
+                                with open(file_to_load, "rb") as f:
+                                        self.config = _config_from_json(json.loads(f.read()))
+                                self._load_cache[path] = (stamp, _copy_config(self.config))
                                 return True
                         except Exception as e:
                                 print(f"Error loading config: {e}")
@@ -51,83 +113,60 @@ class ConfigManager:
                 """Save configuration to a JSON file."""
                 file_to_save = filepath or self.config_file
                 try:
-                        with open(file_to_save, "w") as f:
-                                # Custom formatting to keep arrays on single lines
-                                json_str = json.dumps(
-                                        self.config, indent=2, ensure_ascii=False
-                                )
-                                # Compact arrays by removing newlines within them
-                                import re
-
-                                # Match arrays and compress them to single lines
-                                json_str = re.sub(r"\[\s+", "[", json_str)
-                                json_str = re.sub(r"\s+\]", "]", json_str)
-                                json_str = re.sub(r",\s+(\d)", r", \1", json_str)
-                                f.write(json_str)
+                        payload = _format_config(_config_to_json(self.config)).encode(
+                                "utf-8"
+                        )
+                        with open(file_to_save, "wb") as f:
+                                f.write(payload)
+                        # Record what was written, so a save and a reload landing in
+                        # the same mtime tick with the same size cannot read stale data
+                        path, stamp = self._file_stamp(file_to_save)
+                        self._load_cache[path] = (stamp, _copy_config(self.config))
                         return True
                 except Exception as e:
                         print(f"Error saving config: {e}")
                         return False
 
+        @staticmethod
+        def _file_stamp(filepath):
+                """(absolute path, (mtime_ns, size)) of a config file, for the load cache."""
+                st = os.stat(filepath)
+                return os.path.abspath(filepath), (st.st_mtime_ns, st.st_size)
+
         def set_dimensions(self, width, height):
                 """Set the puzzle dimensions."""
-                old_width = self.config.get("width", 0)
-                old_height = self.config.get("height", 0)
-
-                self.config["width"] = width
-                self.config["height"] = height
-
-                # Only reset clues if dimensions actually changed
-                if old_width != width or old_height != height:
-                        # Preserve existing clues and only add missing ones
-                        if "rows" not in self.config:
-                                self.config["rows"] = {}
-                        if "columns" not in self.config:
-                                self.config["columns"] = {}
-
-                        # Add missing row entries
-                        for i in range(height):
-                                if str(i) not in self.config["rows"]:
-                                        self.config["rows"][str(i)] = []
-
-                        # Add missing column entries
-                        for i in range(width):
-                                if str(i) not in self.config["columns"]:
-                                        self.config["columns"][str(i)] = []
-
-                        # Remove extra rows if height decreased
-                        rows_to_remove = [
-                                k
-                                for k in self.config["rows"].keys()
-                                if int(k) >= height
-                        ]
-                        for k in rows_to_remove:
-                                del self.config["rows"][k]
-
-                        # Remove extra columns if width decreased
-                        cols_to_remove = [
-                                k
-                                for k in self.config["columns"].keys()
-                                if int(k) >= width
-                        ]
-                        for k in cols_to_remove:
-                                del self.config["columns"][k]
+                config = self.config
+                # Unchanged (the common case on redraws): nothing to resize
+                if config.get("width") == width and config.get("height") == height:
+                        return
+
+                config["width"] = width
+                config["height"] = height
+
+                # Preserve existing clues, pad with empty ones and drop those past
+                # the new size
+                for key, count in (("rows", height), ("columns", width)):
+                        clues = config.setdefault(key, [])
+                        del clues[count:]
+                        clues.extend([] for _ in range(count - len(clues)))
 
         def set_row_clue(self, row_index, clues):
                 """Set clue for a specific row. clues should be a list of integers."""
-                self.config["rows"][str(row_index)] = clues
+                self.config["rows"][row_index] = clues
 
         def set_column_clue(self, col_index, clues):
                 """Set clue for a specific column. clues should be a list of integers."""
-                self.config["columns"][str(col_index)] = clues
+                self.config["columns"][col_index] = clues
 
         def get_row_clue(self, row_index):
                 """Get clue for a specific row."""
-                return self.config["rows"].get(str(row_index), [])
+                rows = self.config["rows"]
+                return rows[row_index] if row_index < len(rows) else []
 
         def get_column_clue(self, col_index):
                 """Get clue for a specific column."""
-                return self.config["columns"].get(str(col_index), [])
+                columns = self.config["columns"]
+                return columns[col_index] if col_index < len(columns) else []
 
         def get_dimensions(self):
                 """Get puzzle dimensions."""
@@ -1,6 +1,6 @@
 """Random nonogram puzzle generator."""
 
-import random
+import numpy as np
 
 
 class PuzzleGenerator:
@@ -19,52 +19,56 @@ class PuzzleGenerator:
                 Returns:
                     list: The generated random grid (2D array of 0s and 1s)
                 """
-                # Create random 2D array (0 or 1)
-                random_grid = [
-                        [random.randint(0, 1) for _ in range(width)]
-                        for _ in range(height)
-                ]
-
-                # Print to terminal
-                print("\n" + "=" * 50)
-                print("Generated Random Puzzle")
-                print("=" * 50)
-                print(f"Dimensions: {width}x{height}\n")
-                print("Grid (1 = filled, 0 = empty):")
-                for row in random_grid:
-                        print("  " + " ".join(str(cell) for cell in row))
-                print()
-
-                # Generate row clues
-                row_clues = {}
-                for r, row in enumerate(random_grid):
-                        clues = PuzzleGenerator._generate_clues_from_line(row)
-                        row_clues[str(r)] = clues
-                        print(f"Row {r}: {clues}")
-
-                print()
-
-                # Generate column clues
-                col_clues = {}
-                for c in range(width):
-                        column = [random_grid[r][c] for r in range(height)]
-                        clues = PuzzleGenerator._generate_clues_from_line(column)
-                        col_clues[str(c)] = clues
-                        print(f"Col {c}: {clues}")
-
-                print("=" * 50 + "\n")
+                # Create random 2D array (0 or 1), filled in one call
+                grid = np.random.default_rng().integers(
+                        0, 2, size=(height, width), dtype=np.uint8
+                )
+                random_grid = grid.tolist()
+
+                # Generate row and column clues
+                row_clues, col_clues = PuzzleGenerator.clues_for_grid(grid)
+
+                # Print to terminal, as one write
+                report = ["\n" + "=" * 50, "Generated Random Puzzle", "=" * 50]
+                report.append(f"Dimensions: {width}x{height}\n")
+                report.append("Grid (1 = filled, 0 = empty):")
+                report.extend("  " + " ".join(map(str, row)) for row in random_grid)
+                report.append("")
+                report.extend(f"Row {r}: {clues}" for r, clues in enumerate(row_clues))
+                report.append("")
+                report.extend(f"Col {c}: {clues}" for c, clues in enumerate(col_clues))
+                report.append("=" * 50 + "\n")
+                print("\n".join(report))
 
                 # Update config with generated clues
-                for r, clues in row_clues.items():
-                        config_manager.set_row_clue(int(r), clues)
-                for c, clues in col_clues.items():
-                        config_manager.set_column_clue(int(c), clues)
+                config_manager.set_dimensions(width, height)
+                for r, clues in enumerate(row_clues):
+                        config_manager.set_row_clue(r, clues)
+                for c, clues in enumerate(col_clues):
+                        config_manager.set_column_clue(c, clues)
 
                 # Save config
                 config_manager.save_config()
 
                 return random_grid
 
+        @staticmethod
+        def clues_for_grid(grid):
+                """
+                Generate the row and column clues a grid of 1s and 0s satisfies.
+
+                Args:
+                    grid: 2D array (or list of equal-length lists) of 0s and 1s
+
+                Returns:
+                    tuple: (row clues, column clues), one list of numbers per line
+                """
+                grid = np.asarray(grid)
+                return (
+                        PuzzleGenerator._generate_clues_from_lines(grid),
+                        PuzzleGenerator._generate_clues_from_lines(grid.T),
+                )
+
         @staticmethod
         def _generate_clues_from_line(line):
                 """
@@ -76,14 +80,29 @@ class PuzzleGenerator:
                 Returns:
                     list: Clue numbers representing consecutive filled cells
                 """
-                clues = []
-                count = 0
-                for cell in line:
-                        if cell == 1:
-                                count += 1
-                        elif count > 0:
-                                clues.append(count)
-                                count = 0
-                if count > 0:
-                        clues.append(count)
-                return clues
+                return PuzzleGenerator._generate_clues_from_lines([line])[0]
+
+        @staticmethod
+        def _generate_clues_from_lines(lines):
+                """
+                Generate the clue numbers of every row of a 2D array of 1s and 0s.
+
+                Run-length encodes all rows at once: with a white cell padded on
+                both ends, runs start where a row steps 0 -> 1 and end where it
+                steps 1 -> 0, and np.nonzero lists both in row order.
+
+                Args:
+                    lines: 2D array (or list of equal-length lists) of 0s and 1s
+
+                Returns:
+                    list: One list of clue numbers per row
+                """
+                cells = np.asarray(lines, dtype=np.int8).reshape(len(lines), -1)
+                steps = np.diff(np.pad(cells, ((0, 0), (1, 1))), axis=1)
+                start_rows, starts = np.nonzero(steps == 1)
+                _, ends = np.nonzero(steps == -1)
+                runs = np.split(
+                        ends - starts,
+                        np.cumsum(np.bincount(start_rows, minlength=len(cells)))[:-1],
+                )
+                return [run.tolist() for run in runs]
@@ -1,19 +1,35 @@
 """Main UI application for puzzle configuration and solution display."""
 
+import hashlib
+import json
 import multiprocessing
-import queue
+import os
+import tempfile
 import time
 import tkinter as tk
+from collections import OrderedDict
+from pathlib import Path
 from tkinter import messagebox, ttk
 
+import numpy as np
+
+from core import PuzzleGenerator
+
 from .configurator import ConfiguratorUI
-from .display_nonogram import create_canvas_from_grid
-from .worker import solve_process_worker
+from .display_nonogram import create_canvas_from_grid, recolor_cells
+from .worker import solve_worker_loop
 
 
 class NonogramSolverApp:
         """Main application window."""
 
+        # Verified solutions remembered per (algorithm, puzzle), LRU-evicted
+        solve_cache_size = 32
+        # Second cache tier: the same verified solutions, kept across sessions
+        solve_cache_dir = Path.home() / ".cache" / "nonogram_solver"
+        # Oldest entries past this many are deleted when a new one is saved
+        solve_cache_max_files = 256
+
         def __init__(self, root):
                 self.root = root
                 self.root.minsize(440, 500)
@@ -23,12 +39,23 @@ class NonogramSolverApp:
                 self.cached_solution = None
                 self.cached_row_clues = None
                 self.cached_col_clues = None
-
-                # Multiprocessing tools
-                self.solve_queue = multiprocessing.Queue()
-                self.current_process = None
+                # Grid currently drawn in the solution tab (None: nothing drawn),
+                # and the widgets drawing it, kept for in-place updates
+                self.rendered_solution = None
+                self.solution_view = None
+                # Pending root.after id of the debounced scrollregion update
+                self._resize_after_id = None
+                # _solve_key -> (solution grid, solve time) of verified solves
+                self.solve_cache = OrderedDict()
+
+                # Multiprocessing tools: one long-lived worker takes solve tasks
+                self.task_queue = None
+                self.result_conn = None
+                self.worker_process = None
                 self.is_solving = False
                 self.solve_start_time = None
+                # (algorithm name, ruleset) of the solve in flight
+                self.pending_solve = None
                 self.solve_time = None
 
                 self.notebook = ttk.Notebook(self.root)
@@ -41,6 +68,8 @@ class NonogramSolverApp:
                         self.config_frame, callback=self.on_solve
                 )
                 self.configurator.set_cache_invalidator(self.invalidate_solution_cache)
+                # Auto-save is deferred; closing the window must not drop it
+                self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
                 # Get the main container (child of config_frame)
                 main_container = self.configurator.parent.winfo_children()[0]
@@ -80,6 +109,50 @@ class NonogramSolverApp:
                 )
                 self.status_label.grid(row=1, column=0, sticky="ew", padx=5, pady=5)
 
+                # Start the worker now, so the first solve does not wait for it
+                self._ensure_worker()
+
+        def on_close(self):
+                """Save pending configurator edits, then close the window."""
+                self.configurator.flush_pending_save()
+                self.root.destroy()
+
+        def _ensure_worker(self):
+                """Start the solver worker process if it is not running."""
+                if self.worker_process is not None and self.worker_process.is_alive():
+                        return
+                # Fresh channels: a terminated worker may have left them unusable
+                self._close_result_conn()
+                self.task_queue = multiprocessing.Queue()
+                self.result_conn, result_sender = multiprocessing.Pipe(duplex=False)
+                self.worker_process = multiprocessing.Process(
+                        target=solve_worker_loop,
+                        args=(self.task_queue, result_sender),
+                )
+                self.worker_process.daemon = True
+                self.worker_process.start()
+                # Only the worker writes; dropping our copy lets a dead worker
+                # show up as end-of-file instead of a silent hang
+                result_sender.close()
+
+                # Have Tk wake us when a result arrives instead of polling for it
+                # (not available on Windows, which polls in _check_solve_queue)
+                create_handler = getattr(self.root.tk, "createfilehandler", None)
+                if create_handler is not None:
+                        create_handler(
+                                self.result_conn.fileno(), tk.READABLE, self._on_result_ready
+                        )
+
+        def _close_result_conn(self):
+                """Stop listening on the current worker's result pipe."""
+                if self.result_conn is None:
+                        return
+                delete_handler = getattr(self.root.tk, "deletefilehandler", None)
+                if delete_handler is not None:
+                        delete_handler(self.result_conn.fileno())
+                self.result_conn.close()
+                self.result_conn = None
+
         def on_solve(self, config, algorithm_name):
                 """
                 Handle solve action.
@@ -94,10 +167,9 @@ class NonogramSolverApp:
                 try:
                         width = config["width"]
                         height = config["height"]
-                        rows_dict = config.get("rows", {})
-                        cols_dict = config.get("columns", {})
-                        rows = [rows_dict.get(str(i), []) for i in range(height)]
-                        columns = [cols_dict.get(str(i), []) for i in range(width)]
+                        # Snapshots: the solution view keeps these after later edits
+                        rows = list(config["rows"])
+                        columns = list(config["columns"])
 
                         ruleset = {
                                 "width": width,
@@ -106,29 +178,42 @@ class NonogramSolverApp:
                                 "columns": columns,
                         }
 
+                        # Solved this exact puzzle before: show that, no worker round trip
+                        key = self._solve_key(algorithm_name, ruleset)
+                        cached = self.solve_cache.get(key)
+                        if cached is None:
+                                cached = self._load_cached_solve(key, ruleset)
+                                if cached is not None:
+                                        self._remember_solve(key, *cached)
+                        if cached is not None:
+                                self.solve_cache.move_to_end(key)
+                                grid, elapsed = cached
+                                self.pending_solve = (algorithm_name, ruleset)
+                                self._handle_solve_success(
+                                        {
+                                                "status": "success",
+                                                "solution": grid,
+                                                "elapsed": elapsed,
+                                                "cached": True,
+                                        }
+                                )
+                                return
+
                         self.is_solving = True
                         self.solve_start_time = time.time()
+                        self.pending_solve = (algorithm_name, ruleset)
                         self.status_label.config(
                                 text=f"Solving... ({algorithm_name})", foreground="blue"
                         )
                         self.root.config(cursor="watch")
                         self.stop_button.config(state="normal")  # Enable Stop button
 
-                        # Start Process
-                        self.current_process = multiprocessing.Process(
-                                target=solve_process_worker,
-                                args=(
-                                        algorithm_name,
-                                        ruleset,
-                                        rows_dict,
-                                        cols_dict,
-                                        self.solve_queue,
-                                ),
-                        )
-                        self.current_process.daemon = True
-                        self.current_process.start()
+                        # Hand the puzzle to the worker
+                        self._ensure_worker()
+                        self.task_queue.put((algorithm_name, ruleset))
 
-                        self.root.after(100, self._check_solve_queue)
+                        if not hasattr(self.root.tk, "createfilehandler"):
+                                self.root.after(100, self._check_solve_queue)
 
                 except Exception as e:
                         self.cleanup_solve_state()
@@ -138,54 +223,78 @@ class NonogramSolverApp:
 
         def stop_solving(self):
                 """Manually kill the solving process."""
-                if (
-                        self.is_solving
-                        and self.current_process
-                        and self.current_process.is_alive()
-                ):
-                        # FORCE KILL THE PROCESS
-                        self.current_process.terminate()
-                        self.current_process.join()
-
-                        self.cleanup_solve_state()
+                if self._cancel_solve():
                         self.status_label.config(
                                 text="Solving stopped by user.", foreground="orange"
                         )
                         messagebox.showinfo("Stopped", "Solver process terminated.")
 
-        def _check_solve_queue(self):
+        def _cancel_solve(self):
+                """Kill the solve in flight, if any; returns whether there was one."""
+                if not (
+                        self.is_solving
+                        and self.worker_process
+                        and self.worker_process.is_alive()
+                ):
+                        return False
+                # FORCE KILL THE PROCESS, then warm up its replacement
+                # now rather than on the next solve
+                self._close_result_conn()
+                self.worker_process.terminate()
+                self.worker_process.join()
+                self.worker_process = None
+                self._ensure_worker()
+
+                self.cleanup_solve_state()
+                return True
+
+        def _on_result_ready(self, fileno=None, mask=None):
+                """Tk file handler: the worker sent a result (or went away)."""
                 try:
-                        result = self.solve_queue.get_nowait()
+                        result = self.result_conn.recv()
+                except EOFError:
+                        # Worker died without answering; stop watching its pipe
+                        self._close_result_conn()
+                        if self.is_solving:
+                                self.cleanup_solve_state()
+                                self._handle_solve_error("Solver process exited unexpectedly")
+                        return
 
-                        self.cleanup_solve_state()
+                self.cleanup_solve_state()
 
-                        if result["status"] == "success":
-                                self._handle_solve_success(result)
-                        else:
-                                self._handle_solve_error(result["message"])
+                if result["status"] == "success":
+                        self._handle_solve_success(result)
+                else:
+                        self._handle_solve_error(result["message"])
 
-                except queue.Empty:
-                        if self.is_solving:
-                                self.root.after(100, self._check_solve_queue)
+        def _check_solve_queue(self):
+                """Polling fallback for platforms without Tk file handlers."""
+                if not self.is_solving or self.result_conn is None:
+                        return
+                if self.result_conn.poll():
+                        self._on_result_ready()
+                else:
+                        self.root.after(100, self._check_solve_queue)
 
         def cleanup_solve_state(self):
                 """Resets UI and process variables."""
                 self.is_solving = False
-                self.current_process = None
                 self.root.config(cursor="")
                 self.stop_button.config(state="disabled")
 
         def _handle_solve_success(self, result):
                 grid = result["solution"]
-                rows_dict = result["rows_dict"]
-                cols_dict = result["cols_dict"]
-                algo_name = result["algorithm_name"]
+                algo_name, ruleset = self.pending_solve
+                row_clues = ruleset["rows"]
+                col_clues = ruleset["columns"]
 
-                # Calculate solve time
-                elapsed_time = time.time() - self.solve_start_time if self.solve_start_time else 0
+                # Calculate solve time (a cached result reports its original run)
+                elapsed_time = result.get("elapsed")
+                if elapsed_time is None:
+                        elapsed_time = time.time() - self.solve_start_time if self.solve_start_time else 0
 
                 # Check if the solver returned an empty grid (no solution found)
-                if not grid or len(grid) == 0:
+                if grid.size == 0:
                         messagebox.showwarning(
                                 "No Solution",
                                 "The solver could not find a valid solution for this puzzle.\n"
@@ -197,19 +306,137 @@ class NonogramSolverApp:
                         return
 
                 self.cached_solution = grid
-                self.cached_row_clues = rows_dict
-                self.cached_col_clues = cols_dict
+                self.cached_row_clues = row_clues
+                self.cached_col_clues = col_clues
                 self.solve_time = elapsed_time
 
-                self.display_solution(grid, rows_dict, cols_dict)
+                # Only remember grids that satisfy the clues, so that a stochastic
+                # solver's miss can still be retried
+                if not result.get("cached") and self._solves_clues(grid, ruleset):
+                        key = self._solve_key(algo_name, ruleset)
+                        self._remember_solve(key, grid, elapsed_time)
+                        self._store_cached_solve(key, grid, elapsed_time)
+
+                self.display_solution(grid, row_clues, col_clues)
                 self.notebook.select(1)
 
                 time_str = f"{elapsed_time:.5f}s"
+                if result.get("cached"):
+                        time_str += " (cached)"
                 self.status_label.config(
-                        text=f"Solved {result['width']}x{result['height']} using {algo_name} in {time_str}",
+                        text=f"Solved {ruleset['width']}x{ruleset['height']} using {algo_name} in {time_str}",
                         foreground="green",
                 )
 
+        @staticmethod
+        def _solve_key(algorithm_name, ruleset):
+                """Hashable key of a solve: the algorithm and the full puzzle."""
+                return (
+                        algorithm_name,
+                        ruleset["width"],
+                        ruleset["height"],
+                        tuple(map(tuple, ruleset["rows"])),
+                        tuple(map(tuple, ruleset["columns"])),
+                )
+
+        @staticmethod
+        def _solves_clues(grid, ruleset):
+                """Whether grid's clues are exactly the ruleset's."""
+                return PuzzleGenerator.clues_for_grid(grid) == (
+                        [list(clues) for clues in ruleset["rows"]],
+                        [list(clues) for clues in ruleset["columns"]],
+                )
+
+        def _remember_solve(self, key, grid, elapsed_time):
+                """Put a verified solve in the in-memory LRU cache."""
+                self.solve_cache[key] = (grid, elapsed_time)
+                if len(self.solve_cache) > self.solve_cache_size:
+                        self.solve_cache.popitem(last=False)
+
+        def _cache_path(self, key):
+                """File of the on-disk cache entry for a _solve_key."""
+                digest = hashlib.blake2b(
+                        json.dumps(key).encode("utf-8"), digest_size=16
+                ).hexdigest()
+                return self.solve_cache_dir / f"{digest}.npz"
+
+        def _load_cached_solve(self, key, ruleset):
+                """(grid, solve time) saved by an earlier session, or None."""
+                path = self._cache_path(key)
+                try:
+                        with np.load(path) as data:
+                                grid = data["grid"].astype(np.uint8, copy=False)
+                                elapsed_time = float(data["elapsed"])
+                except FileNotFoundError:
+                        return None
+                except Exception:
+                        # Truncated or foreign file: np.load raises anything from
+                        # BadZipFile to EOFError, and it would fail the same way again
+                        self._drop_cached_solve(path)
+                        return None
+                # Entries are only written for verified grids; recheck anyway,
+                # the file may be stale or corrupt
+                if grid.shape != (
+                        ruleset["height"],
+                        ruleset["width"],
+                ) or not self._solves_clues(grid, ruleset):
+                        self._drop_cached_solve(path)
+                        return None
+                # Mark it recently used, so pruning drops other entries first
+                try:
+                        os.utime(path)
+                except OSError:
+                        pass
+                return grid, elapsed_time
+
+        @staticmethod
+        def _drop_cached_solve(path):
+                """Delete an unusable cache entry (best effort)."""
+                try:
+                        os.unlink(path)
+                except OSError:
+                        pass
+
+        def _store_cached_solve(self, key, grid, elapsed_time):
+                """Save a verified solve for later sessions (best effort)."""
+                path = self._cache_path(key)
+                tmp_path = None
+                try:
+                        path.parent.mkdir(parents=True, exist_ok=True)
+                        # Unique temp file, so concurrent app instances never
+                        # replace an entry with each other's half-written file
+                        with tempfile.NamedTemporaryFile(
+                                dir=path.parent, suffix=".tmp", delete=False
+                        ) as f:
+                                tmp_path = f.name
+                                np.savez(f, grid=grid, elapsed=elapsed_time)
+                        os.replace(tmp_path, path)
+                except OSError:
+                        if tmp_path is not None:
+                                try:
+                                        os.unlink(tmp_path)
+                                except OSError:
+                                        pass
+                        return
+                self._prune_disk_cache()
+
+        def _prune_disk_cache(self):
+                """Delete the least recently used entries past solve_cache_max_files."""
+                entries = []
+                for entry in self.solve_cache_dir.glob("*.npz"):
+                        try:
+                                entries.append((entry.stat().st_mtime, entry))
+                        except OSError:
+                                pass  # Removed by another instance meanwhile
+                if len(entries) <= self.solve_cache_max_files:
+                        return
+                entries.sort()
+                for _, entry in entries[: len(entries) - self.solve_cache_max_files]:
+                        try:
+                                entry.unlink()
+                        except OSError:
+                                pass
+
         def _handle_solve_error(self, error_message):
                 messagebox.showerror(
                         "Solve Error", f"Error solving puzzle: {error_message}"
@@ -220,26 +447,37 @@ class NonogramSolverApp:
 
         def invalidate_solution_cache(self):
                 """Clear cached solution when configuration changes."""
+                # A solve still running is for the old puzzle; free its core
+                self._cancel_solve()
                 self.cached_solution = None
                 self.cached_row_clues = None
                 self.cached_col_clues = None
                 # Remove previously-displayed solution
+                self._cancel_scroll_update()
                 for widget in self.canvas_frame.winfo_children():
                         widget.destroy()
+                self.rendered_solution = None
+                self.solution_view = None
 
                 self.status_label.config(
                         text="Solution outdated. Solve again to update.",
                         foreground="orange",
                 )
 
+        def _cancel_scroll_update(self):
+                """Drop a pending scrollregion update for widgets about to go away."""
+                if self._resize_after_id is not None:
+                        self.root.after_cancel(self._resize_after_id)
+                        self._resize_after_id = None
+
         def display_solution(self, grid=None, row_clues=None, col_clues=None):
                 """
                 Display the solution grid with clues.
 
                 Args:
-                    grid: 2D list representing the solution (uses cache if None)
-                    row_clues: Optional dict of row clues (uses cache if None)
-                    col_clues: Optional dict of column clues (uses cache if None)
+                    grid: 2D uint8 array holding the solution (uses cache if None)
+                    row_clues: Optional list of row clues (uses cache if None)
+                    col_clues: Optional list of column clues (uses cache if None)
                 """
                 # Use cached solution if available and no new grid provided
                 if grid is None:
@@ -249,17 +487,41 @@ class NonogramSolverApp:
                         row_clues = self.cached_row_clues
                         col_clues = self.cached_col_clues
 
+                # Already on screen: skip tearing down and rebuilding the widgets.
+                # The grid object itself is kept, so its id cannot be reused.
+                if grid is self.rendered_solution:
+                        return
+
                 # Validate grid is not empty
-                if not grid or len(grid) == 0:
+                if grid.size == 0:
                         self.status_label.config(
                                 text="No solution to display (empty grid)",
                                 foreground="orange",
                         )
                         return
 
+                # Same puzzle as the grid on screen (e.g. solved again with another
+                # algorithm): repaint only the cells that differ, keep the widgets
+                view = self.solution_view
+                if (
+                        view is not None
+                        and self.rendered_solution.shape == grid.shape
+                        and view["row_clues"] == row_clues
+                        and view["col_clues"] == col_clues
+                ):
+                        changed = np.argwhere(grid != self.rendered_solution).tolist()
+                        recolor_cells(
+                                view["grid_display"], view["grid_drawing"], changed, grid
+                        )
+                        self.rendered_solution = grid
+                        self._update_solution_info(grid)
+                        return
+
                 # Clear previous widgets from canvas_frame
+                self._cancel_scroll_update()
                 for widget in self.canvas_frame.winfo_children():
                         widget.destroy()
+                self.rendered_solution = grid
 
                 # Frame holding scrollable content and info panel
                 content_frame = ttk.Frame(self.canvas_frame)
@@ -292,7 +554,7 @@ class NonogramSolverApp:
                 # Frame holding the grid display; must be a direct child of canvas
                 grid_container = tk.Frame(canvas)
                 # Grid display frame
-                grid_display = create_canvas_from_grid(
+                grid_display, grid_drawing = create_canvas_from_grid(
                         grid_container, grid, row_clues, col_clues
                 )
                 grid_display.pack(fill="both", expand=False)
@@ -302,7 +564,12 @@ class NonogramSolverApp:
                         0, 0, window=grid_container, anchor="nw"
                 )
 
-                def update_scroll_region(event=None):
+                # A resize fires <Configure> many times; coalesce them into one
+                # bbox/itemconfig pass once the events settle
+                last_sizes = {}
+
+                def _do_update_scroll_region():
+                        self._resize_after_id = None
                         canvas.configure(scrollregion=canvas.bbox("all"))
                         canvas.itemconfig(
                                 canvas_window,
@@ -312,6 +579,17 @@ class NonogramSolverApp:
                                 ),
                         )
 
+                def update_scroll_region(event=None):
+                        if event is not None:
+                                size = (event.width, event.height)
+                                if last_sizes.get(event.widget) == size:
+                                        return
+                                last_sizes[event.widget] = size
+                        self._cancel_scroll_update()
+                        self._resize_after_id = self.root.after(
+                                50, _do_update_scroll_region
+                        )
+
                 grid_container.bind("<Configure>", update_scroll_region)
                 canvas.bind("<Configure>", update_scroll_region)
 
@@ -330,19 +608,33 @@ class NonogramSolverApp:
                         content_frame, text="Solution Info", padding="10"
                 )
                 info_frame.grid(row=0, column=2, sticky="n", padx=5, pady=5)
-                rows = len(grid)
-                cols = len(grid[0]) if rows > 0 else 0
-                filled = sum(sum(row) for row in grid)
-                ttk.Label(info_frame, text=f"Size: {cols}x{rows}").pack(
-                        anchor="w", pady=5
-                )
-                ttk.Label(info_frame, text=f"Filled: {filled}/{rows * cols}").pack(
-                        anchor="w", pady=5
+                info_labels = []
+                for _ in range(3):  # Size, filled, time
+                        label = ttk.Label(info_frame)
+                        label.pack(anchor="w", pady=5)
+                        info_labels.append(label)
+
+                self.solution_view = {
+                        "grid_display": grid_display,
+                        "grid_drawing": grid_drawing,
+                        "row_clues": row_clues,
+                        "col_clues": col_clues,
+                        "info_labels": info_labels,
+                }
+                self._update_solution_info(grid)
+
+        def _update_solution_info(self, grid):
+                """Fill in the solution info panel for `grid`."""
+                size_label, filled_label, time_label = self.solution_view["info_labels"]
+                rows, cols = grid.shape
+                filled = int(grid.sum())
+                size_label.config(text=f"Size: {cols}x{rows}")
+                filled_label.config(text=f"Filled: {filled}/{rows * cols}")
+                time_label.config(
+                        text=""
+                        if self.solve_time is None
+                        else f"Time: {self.solve_time:.5f}s"
                 )
-                if self.solve_time is not None:
-                        ttk.Label(info_frame, text=f"Time: {self.solve_time:.5f}s").pack(
-                                anchor="w", pady=5
-                        )
 
 
 def main():
@@ -25,7 +25,12 @@ class ConfiguratorUI:
                 self.config_manager = ConfigManager()
                 self.row_entries = {}
                 self.col_entries = {}
+                # Line index -> [label, entry] hidden by a shrink, kept for reuse
+                self._spare_pairs = {"rows": {}, "columns": {}}
                 self._loading = False  # Flag to prevent auto-save during loading
+                self._save_job = None  # Pending after() id of the deferred auto-save
+                # ("Row"/"Col", index) -> entry text last stored in the config
+                self._collected_text = {}
                 self.setup_ui()
                 self.load_default_config()
 
@@ -139,6 +144,13 @@ class ConfiguratorUI:
                 self.notebook.add(self.row_frame, text="Rows")
                 self.notebook.add(self.col_frame, text="Columns")
 
+                # One auto-save binding for every clue entry, not one per entry
+                self.parent.bind_class("ClueEntry", "<KeyRelease>", self.on_entry_change)
+
+                # Scrollable clue lists; update_clue_entries fills them
+                self.row_scroll_frame = self._build_clue_list(self.row_frame)
+                self.col_scroll_frame = self._build_clue_list(self.col_frame)
+
                 # Initialize clue entries
                 self.update_clue_entries()
 
@@ -208,109 +220,84 @@ class ConfiguratorUI:
                 width = self.width_var.get()
                 height = self.height_var.get()
 
-                # Clear existing widgets
-                for widget in self.row_frame.winfo_children():
-                        widget.destroy()
-                for widget in self.col_frame.winfo_children():
-                        widget.destroy()
-
-                # Create scrollable frames
-                self.row_entries = {}
-                self.col_entries = {}
-
-                # Configure grid layout for row_frame
-                self.row_frame.grid_rowconfigure(0, weight=1)
-                self.row_frame.grid_columnconfigure(0, weight=1)
-
-                # Row clues with grid layout
-                row_canvas = tk.Canvas(self.row_frame, highlightthickness=0)
-                row_scrollbar = ttk.Scrollbar(
-                        self.row_frame, orient="vertical", command=row_canvas.yview
-                )
-                row_scrollable_frame = ttk.Frame(row_canvas)
-
-                row_scrollable_frame.bind(
-                        "<Configure>",
-                        lambda e: row_canvas.configure(
-                                scrollregion=row_canvas.bbox("all")
-                        ),
+                self._sync_clue_entries(
+                        self.row_scroll_frame,
+                        self.row_entries,
+                        "rows",
+                        height,
+                        "Row",
+                        self.config_manager.get_row_clue,
                 )
-
-                row_canvas.create_window(
-                        (0, 0), window=row_scrollable_frame, anchor="nw"
+                self._sync_clue_entries(
+                        self.col_scroll_frame,
+                        self.col_entries,
+                        "columns",
+                        width,
+                        "Col",
+                        self.config_manager.get_column_clue,
                 )
-                row_canvas.configure(yscrollcommand=row_scrollbar.set)
-
-                for i in range(height):
-                        ttk.Label(row_scrollable_frame, text=f"Row {i}:").grid(
-                                row=i, column=0, sticky="w", padx=5, pady=5
-                        )
-                        entry = ttk.Entry(
-                                row_scrollable_frame, width=30, style="NoFocus.TEntry"
-                        )
-                        entry.grid(row=i, column=1, sticky="ew", padx=5, pady=5)
-                        self.row_entries[i] = entry
-                        clues = self.config_manager.get_row_clue(i)
-                        if clues:
-                                entry.insert(0, ",".join(map(str, clues)))
-                        # Bind entry changes to auto-save
-                        entry.bind(
-                                "<KeyRelease>",
-                                lambda *args, idx=i: self.on_entry_change(idx),
-                        )
 
-                row_canvas.grid(row=0, column=0, sticky="nsew")
-                row_scrollbar.grid(row=0, column=1, sticky="ns")
-                self._attach_mousewheel_scroll(row_canvas)
+        def _build_clue_list(self, frame):
+                """Create the scrollable area of a clue tab; returns the inner frame."""
+                # Configure grid layout for the tab
+                frame.grid_rowconfigure(0, weight=1)
+                frame.grid_columnconfigure(0, weight=1)
 
-                # Configure grid layout for col_frame
-                self.col_frame.grid_rowconfigure(0, weight=1)
-                self.col_frame.grid_columnconfigure(0, weight=1)
+                canvas = tk.Canvas(frame, highlightthickness=0)
+                scrollbar = ttk.Scrollbar(frame, orient="vertical", command=canvas.yview)
+                scrollable_frame = ttk.Frame(canvas)
 
-                # Column clues with grid layout
-                col_canvas = tk.Canvas(self.col_frame, highlightthickness=0)
-                col_scrollbar = ttk.Scrollbar(
-                        self.col_frame, orient="vertical", command=col_canvas.yview
-                )
-                col_scrollable_frame = ttk.Frame(col_canvas)
-
-                col_scrollable_frame.bind(
+                scrollable_frame.bind(
                         "<Configure>",
-                        lambda e: col_canvas.configure(
-                                scrollregion=col_canvas.bbox("all")
-                        ),
+                        lambda e: canvas.configure(scrollregion=canvas.bbox("all")),
                 )
 
-                col_canvas.create_window(
-                        (0, 0), window=col_scrollable_frame, anchor="nw"
-                )
-                col_canvas.configure(yscrollcommand=col_scrollbar.set)
+                canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+                canvas.configure(yscrollcommand=scrollbar.set)
 
-                for i in range(width):
-                        ttk.Label(col_scrollable_frame, text=f"Col {i}:").grid(
+                canvas.grid(row=0, column=0, sticky="nsew")
+                scrollbar.grid(row=0, column=1, sticky="ns")
+                self._attach_mousewheel_scroll(canvas)
+                return scrollable_frame
+
+        def _sync_clue_entries(self, frame, entries, kind, count, label, get_clue):
+                """
+                Make frame hold exactly count label/entry pairs showing the config.
+
+                Pairs past the new count are hidden and kept in
+                self._spare_pairs[kind] ("rows" or "columns"), so growing back
+                shows them again instead of creating widgets; the pairs in use
+                are kept and just get their text refreshed.
+                """
+                spare_pairs = self._spare_pairs[kind]
+                for i in range(len(entries) - 1, count - 1, -1):
+                        pair = frame.grid_slaves(row=i, column=0) + [entries.pop(i)]
+                        for widget in pair:
+                                widget.grid_remove()
+                        spare_pairs[i] = pair
+
+                for i in range(len(entries), count):
+                        pair = spare_pairs.pop(i, None)
+                        if pair is not None:
+                                for widget in pair:
+                                        widget.grid()
+                                entries[i] = pair[1]
+                                continue
+                        ttk.Label(frame, text=f"{label} {i}:").grid(
                                 row=i, column=0, sticky="w", padx=5, pady=5
                         )
-                        entry = ttk.Entry(
-                                col_scrollable_frame, width=30, style="NoFocus.TEntry"
-                        )
+                        entry = ttk.Entry(frame, width=30, style="NoFocus.TEntry")
                         entry.grid(row=i, column=1, sticky="ew", padx=5, pady=5)
-                        self.col_entries[i] = entry
-                        entry.grid(row=i, column=1, sticky="ew", padx=5, pady=5)
-                        self.col_entries[i] = entry
-                        clues = self.config_manager.get_column_clue(i)
-                        if clues:
-                                entry.insert(0, ",".join(map(str, clues)))
-                        # Bind entry changes to auto-save
-                        entry.bind(
-                                "<KeyRelease>",
-                                lambda *args, idx=i: self.on_entry_change(
-                                        idx, is_row=False
-                                ),
-                        )
+                        # Edits auto-save through the shared ClueEntry binding
+                        entry.bindtags(entry.bindtags() + ("ClueEntry",))
+                        entries[i] = entry
 
-                col_canvas.grid(row=0, column=0, sticky="nsew")
-                col_scrollbar.grid(row=0, column=1, sticky="ns")
-                self._attach_mousewheel_scroll(col_canvas)
+                for i, entry in entries.items():
+                        text = ",".join(map(str, get_clue(i)))
+                        if entry.get() != text:
+                                entry.delete(0, "end")
+                                entry.insert(0, text)
+                        self._collected_text[label, i] = text
 
         def on_algorithm_change(self, event=None):
                 """Handle algorithm selection change."""
@@ -332,26 +319,33 @@ class ConfiguratorUI:
                 """Handle dimension changes and auto-save."""
                 if self._loading:
                         return  # Skip auto-save during initial load
+                if self._save_job is not None:
+                        # Keep typing not yet collected; the entries get reset below
+                        self.collect_clues()
                 width = self.width_var.get()
                 height = self.height_var.get()
                 self.config_manager.set_dimensions(width, height)
                 self.update_clue_entries()
-                self.auto_save()
+                self.schedule_auto_save()
                 # Invalidate cached solution when dimensions change
                 if self.cache_invalidate_callback:
                         self.cache_invalidate_callback()
 
-        def on_entry_change(self, index, is_row=True):
+        def on_entry_change(self, event=None):
                 """Handle clue entry changes and auto-save."""
                 if self._loading:
                         return  # Skip auto-save during initial load
-                self.collect_clues()
-                self.auto_save()
+                self.schedule_auto_save()
 
         def collect_clues(self):
-                """Collect clues from entry fields into config."""
+                """Collect clues from entry fields into config; returns whether any changed."""
+                changed = False
                 for i, entry in self.row_entries.items():
                         clue_text = entry.get().strip()
+                        # Unchanged since the last collect: nothing to parse
+                        if self._collected_text.get(("Row", i)) == clue_text:
+                                continue
+                        self._collected_text["Row", i] = clue_text
                         if clue_text:
                                 try:
                                         clues = [
@@ -360,14 +354,19 @@ class ConfiguratorUI:
                                                 if x.strip()
                                         ]
                                         self.config_manager.set_row_clue(i, clues)
+                                        changed = True
                                 except ValueError:
                                         # Silently skip invalid entries (don't show dialog on every keystroke)
                                         pass
                         else:
                                 self.config_manager.set_row_clue(i, [])
+                                changed = True
 
                 for i, entry in self.col_entries.items():
                         clue_text = entry.get().strip()
+                        if self._collected_text.get(("Col", i)) == clue_text:
+                                continue
+                        self._collected_text["Col", i] = clue_text
                         if clue_text:
                                 try:
                                         clues = [
@@ -376,16 +375,46 @@ class ConfiguratorUI:
                                                 if x.strip()
                                         ]
                                         self.config_manager.set_column_clue(i, clues)
+                                        changed = True
                                 except ValueError:
                                         # Silently skip invalid entries (don't show dialog on every keystroke)
                                         pass
                         else:
                                 self.config_manager.set_column_clue(i, [])
+                                changed = True
+
+                return changed
 
         def auto_save(self):
                 """Automatically save configuration to default file."""
                 self.config_manager.save_config()
 
+        def schedule_auto_save(self, delay_ms=300):
+                """
+                Collect clues and auto-save once edits pause for delay_ms.
+
+                Each call restarts the wait, so a burst of keystrokes or spinbox
+                clicks ends in a single parse of the entries and a single write.
+                """
+                if self._save_job is not None:
+                        self.parent.after_cancel(self._save_job)
+                self._save_job = self.parent.after(delay_ms, self._flush_auto_save)
+
+        def flush_pending_save(self):
+                """Write a scheduled auto-save now instead of waiting for it."""
+                if self._save_job is not None:
+                        self.parent.after_cancel(self._save_job)
+                        self._flush_auto_save()
+
+        def _flush_auto_save(self):
+                """Run the auto-save scheduled by schedule_auto_save."""
+                self._save_job = None
+                changed = self.collect_clues()
+                self.auto_save()
+                # Edited clues make any running or shown solve outdated
+                if changed and self.cache_invalidate_callback:
+                        self.cache_invalidate_callback()
+
         def _attach_mousewheel_scroll(self, canvas):
                 """Wire the standard wheel/trackpad events to the given Canvas."""
 
@@ -420,6 +449,9 @@ class ConfiguratorUI:
                 # Update UI
                 self.update_clue_entries()
 
+                if self.cache_invalidate_callback:
+                        self.cache_invalidate_callback()
+
         def load_sample(self):
                 """Let user pick a sample JSON from the predefined samples folder and load it."""
                 try:
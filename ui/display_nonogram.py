@@ -1,8 +1,14 @@
 import tkinter as tk
+from tkinter import font as tkfont
+
+import numpy as np
 
 # Configuration
 CELL_SIZE = 30  # Size of each square in pixels
 PADDING = 5  # Padding around the canvas
+CLUE_FONT = ("Arial", 9)
+CLUE_FILL = "lightgray"
+LINE_COLOR = "gray"
 
 
 def create_canvas_from_grid(parent, grid, row_clues=None, col_clues=None):
@@ -11,29 +17,24 @@ def create_canvas_from_grid(parent, grid, row_clues=None, col_clues=None):
 
         Args:
             parent: Parent tkinter widget
-            grid: 2D list representing the puzzle solution
-            row_clues: Optional dict of row clues {index: [clue_numbers]}
-            col_clues: Optional dict of col clues {index: [clue_numbers]}
+            grid: 2D list or array representing the puzzle solution
+            row_clues: Optional list of row clues, [clue_numbers] per row
+            col_clues: Optional list of col clues, [clue_numbers] per column
 
         Returns:
-            tk.Frame: The frame containing the nonogram display
+            tuple: (canvas, drawing) - the tk.Canvas containing the nonogram
+            display, and a dict describing what was drawn on it, to keep
+            alongside the canvas and pass to recolor_cells:
+            "origin" is the (x, y) of the grid's top-left corner,
+            "cell_items" maps (row, col) of every filled cell to its rectangle
+            id, and "clue_font" is the clues' tkfont.Font
         """
-        rows = len(grid)
-        cols = len(grid[0]) if rows > 0 else 0
+        grid = np.asarray(grid, dtype=np.uint8)
+        rows, cols = grid.shape if grid.ndim == 2 else (0, 0)
 
         # Calculate dimensions needed for clues
-        max_col_clues = 0
-        max_row_clues = 0
-
-        if col_clues:
-                for c in range(cols):
-                        clue_list = col_clues.get(str(c), [])
-                        max_col_clues = max(max_col_clues, len(clue_list))
-
-        if row_clues:
-                for r in range(rows):
-                        clue_list = row_clues.get(str(r), [])
-                        max_row_clues = max(max_row_clues, len(clue_list))
+        max_col_clues = max(map(len, col_clues[:cols]), default=0) if col_clues else 0
+        max_row_clues = max(map(len, row_clues[:rows]), default=0) if row_clues else 0
 
         # Calculate the total canvas size
         clue_area_width = max_row_clues * CELL_SIZE
@@ -53,11 +54,14 @@ def create_canvas_from_grid(parent, grid, row_clues=None, col_clues=None):
                 bg="white",
                 highlightthickness=0,
         )
+        # One named font for every clue, instead of Tk resolving the font
+        # description again for each create_text; returned in the drawing
+        # because Tk deletes the font when the object is collected
+        clue_font = tkfont.Font(root=canvas, family=CLUE_FONT[0], size=CLUE_FONT[1])
 
         # Draw column clues (top area)
         if col_clues:
-                for c in range(cols):
-                        clue_list = col_clues.get(str(c), [])
+                for c, clue_list in enumerate(col_clues[:cols]):
                         x_start = PADDING + clue_area_width + (c * CELL_SIZE)
 
                         offset = max_col_clues - len(clue_list)
@@ -69,20 +73,19 @@ def create_canvas_from_grid(parent, grid, row_clues=None, col_clues=None):
                                         y_pos,
                                         x_start + CELL_SIZE,
                                         y_pos + CELL_SIZE,
-                                        fill="lightgray",
-                                        outline="gray",
+                                        fill=CLUE_FILL,
+                                        outline=LINE_COLOR,
                                 )
                                 canvas.create_text(
                                         x_start + CELL_SIZE / 2,
                                         y_pos + CELL_SIZE / 2,
                                         text=str(clue_num),
-                                        font=("Arial", 9),
+                                        font=clue_font,
                                 )
 
         # Draw row clues (left area)
         if row_clues:
-                for r in range(rows):
-                        clue_list = row_clues.get(str(r), [])
+                for r, clue_list in enumerate(row_clues[:rows]):
                         y_start = PADDING + clue_area_height + (r * CELL_SIZE)
 
                         offset = max_row_clues - len(clue_list)
@@ -94,43 +97,71 @@ def create_canvas_from_grid(parent, grid, row_clues=None, col_clues=None):
                                         y_start,
                                         x_pos + CELL_SIZE,
                                         y_start + CELL_SIZE,
-                                        fill="lightgray",
-                                        outline="gray",
+                                        fill=CLUE_FILL,
+                                        outline=LINE_COLOR,
                                 )
                                 canvas.create_text(
                                         x_pos + CELL_SIZE / 2,
                                         y_start + CELL_SIZE / 2,
                                         text=str(clue_num),
-                                        font=("Arial", 9),
+                                        font=clue_font,
                                 )
 
-        # Draw the grid (main area)
+        # Draw the grid (main area): the canvas background is the white cells,
+        # so only filled cells get a rectangle, over one line per grid line
         start_x = PADDING + clue_area_width
         start_y = PADDING + clue_area_height
 
-        for r in range(rows):
+        for r in range(rows + 1):
                 y = start_y + (r * CELL_SIZE)
-                for c in range(cols):
-                        x = start_x + (c * CELL_SIZE)
+                canvas.create_line(start_x, y, start_x + grid_width, y, fill=LINE_COLOR)
+        for c in range(cols + 1):
+                x = start_x + (c * CELL_SIZE)
+                canvas.create_line(x, start_y, x, start_y + grid_height, fill=LINE_COLOR)
+
+        drawing = {
+                "origin": (start_x, start_y),
+                "cell_items": {},
+                "clue_font": clue_font,
+        }
+        for r, c in np.argwhere(grid == 1).tolist():
+                _fill_cell(canvas, drawing, r, c)
+
+        return canvas, drawing
+
+
+def _fill_cell(canvas, drawing, r, c):
+        """Draw the black rectangle of filled cell (r, c)."""
+        start_x, start_y = drawing["origin"]
+        x = start_x + (c * CELL_SIZE)
+        y = start_y + (r * CELL_SIZE)
+        drawing["cell_items"][r, c] = canvas.create_rectangle(
+                x, y, x + CELL_SIZE, y + CELL_SIZE, fill="black", outline=LINE_COLOR
+        )
 
-                        value = grid[r][c]
-                        color = "black" if value == 1 else "white"
 
-                        canvas.create_rectangle(
-                                x,
-                                y,
-                                x + CELL_SIZE,
-                                y + CELL_SIZE,
-                                fill=color,
-                                outline="gray",
-                        )
+def recolor_cells(canvas, drawing, cells, grid):
+        """
+        Repaint some cells of a canvas built by create_canvas_from_grid in place.
 
-        return canvas
+        Args:
+            canvas: Canvas returned by create_canvas_from_grid
+            drawing: Drawing dict returned with it; updated in place
+            cells: Iterable of (row, col) pairs to repaint
+            grid: 2D uint8 array (rows x cols) holding the new cell values
+        """
+        cell_items = drawing["cell_items"]
+        for r, c in cells:
+                item = cell_items.pop((r, c), None)
+                if item is not None:
+                        canvas.delete(item)
+                if grid[r, c] == 1:
+                        _fill_cell(canvas, drawing, r, c)
 
 
 def display(grid, row_clues=None, col_clues=None):
         root = tk.Tk()
         root.title("Nonogram Display")
-        frame = create_canvas_from_grid(root, grid, row_clues, col_clues)
-        frame.pack()
+        canvas, drawing = create_canvas_from_grid(root, grid, row_clues, col_clues)
+        canvas.pack()
         root.mainloop()
@@ -3,15 +3,33 @@ Background worker process for solving puzzles.
 This file handles the heavy computation in a separate process.
 """
 
+import numpy as np
 
-def solve_process_worker(solver_name, ruleset, rows_dict, cols_dict, result_queue):
+# The configurator imports this too, so a forked worker inherits the
+# discovered solvers; a spawned one discovers them once, on import
+from algorithms import get_solver
+
+
+def solve_worker_loop(task_queue, result_conn):
         """
-        Independent process that runs the solver.
+        Long-lived process that runs solves one after another.
+
+        Takes (solver_name, ruleset) tasks off task_queue until it gets None, so
+        process start-up and the solver imports are paid once, not per solve.
         """
-        try:
-                # Re-import inside process to avoid pickling issues
-                from algorithms import get_solver
+        while True:
+                task = task_queue.get()
+                if task is None:
+                        break
+                solver_name, ruleset = task
+                solve_process_worker(solver_name, ruleset, result_conn)
 
+
+def solve_process_worker(solver_name, ruleset, result_conn):
+        """
+        Run one solve and send its result down result_conn.
+        """
+        try:
                 solver = get_solver(solver_name)
 
                 if not solver:
@@ -19,16 +37,13 @@ def solve_process_worker(solver_name, ruleset, rows_dict, cols_dict, result_queu
 
                 # Heavy computation happens here
                 solution = solver.solve(ruleset)
+                # Ship the grid as one packed uint8 array (a byte per cell)
+                # rather than a list of lists of boxed ints
+                solution = np.ascontiguousarray(
+                        [] if solution is None else solution, dtype=np.uint8
+                )
 
-                result = {
-                        "status": "success",
-                        "solution": solution,
-                        "rows_dict": rows_dict,
-                        "cols_dict": cols_dict,
-                        "algorithm_name": solver_name,
-                        "width": ruleset["width"],
-                        "height": ruleset["height"],
-                }
-                result_queue.put(result)
+                # The UI still holds the puzzle it sent, so only the grid goes back
+                result_conn.send({"status": "success", "solution": solution})
         except Exception as e:
-                result_queue.put({"status": "error", "message": str(e)})
+                result_conn.send({"status": "error", "message": str(e)})